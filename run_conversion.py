@@ -64,6 +64,12 @@ def main():
         default='data/processed',
         help='Output directory for processed data (default: data/processed)'
     )
+    parser.add_argument(
+        '--force-compression',
+        default=None,
+        help='DuckDB storage compression to force for every column, '
+             'e.g. zstd (default: chosen by DuckDB)'
+    )
 
     args = parser.parse_args()
 
@@ -92,11 +98,13 @@ def main():
         print("=" * 80)
         db_stats = create_air_quality_database(
             parquet_dir=args.output_dir,
-            db_path=f"{args.output_dir}/air_quality.duckdb"
+            db_path=f"{args.output_dir}/air_quality.duckdb",
+            force_compression=args.force_compression
         )
         print(f"\n[SUCCESS] DuckDB database created")
         print(f"  - Rows: {db_stats['table_count']:,}")
         print(f"  - Views: {', '.join(db_stats['views_created'])}")
+        print(f"  - Summary tables: {', '.join(db_stats['tables_materialized'])}")
 
         # Step 3: Validate data integrity
         if not args.skip_validation:
@@ -2,12 +2,12 @@
 CSV to Parquet Converter for Air Quality Data
 
 This module handles the conversion of large CSV air quality datasets to optimized
-Parquet format with partitioning by year for efficient storage and query performance.
+Parquet format with partitioning by year and month for efficient storage and query performance.
 
 Features:
 - Chunked reading to handle large files without memory overflow
 - Automatic data type optimization
-- Year-based partitioning for efficient queries
+- Year/month partitioning for efficient queries
 - Progress tracking and logging
 - Data validation and error handling
 
@@ -36,7 +36,7 @@ class CSVToParquetConverter:
     Converts large CSV air quality datasets to partitioned Parquet format.
 
     This class handles the conversion process with memory-efficient chunked reading,
-    automatic data type optimization, and year-based partitioning for better
+    automatic data type optimization, and year/month partitioning for better
     query performance.
 
     Attributes:
@@ -73,6 +73,15 @@ class CSVToParquetConverter:
         'siteid': 'float32'
     }
 
+    # Column groups resolved once from the static DTYPE_MAP rather than
+    # re-classifying every column for each chunk
+    NUMERIC_DTYPES = {
+        col: dtype for col, dtype in DTYPE_MAP.items() if dtype != 'category'
+    }
+    CATEGORY_COLUMNS = [
+        col for col, dtype in DTYPE_MAP.items() if dtype == 'category'
+    ]
+
     def __init__(
         self,
         csv_path: str,
@@ -91,6 +100,9 @@ class CSVToParquetConverter:
         self.output_dir = Path(output_dir)
         self.chunk_size = chunk_size
 
+        # Categorical dtypes shared by every chunk (see _shared_category_dtype)
+        self._category_dtypes: Dict[str, pd.CategoricalDtype] = {}
+
         # Validate inputs
         if not self.csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
@@ -107,7 +119,7 @@ class CSVToParquetConverter:
         This method converts columns to more memory-efficient types:
         - String columns with limited unique values -> category
         - Float64 -> Float32 (where precision loss is acceptable)
-        - Parse date strings to datetime objects
+        - Parse date strings that read_csv could not convert to datetime
 
         Args:
             df: Input DataFrame
@@ -117,38 +129,96 @@ class CSVToParquetConverter:
         """
         logger.debug("Optimizing data types...")
 
-        # Convert date column to datetime with mixed format support
-        if 'date' in df.columns:
+        # Dates are normally parsed by read_csv already; convert here only
+        # when a chunk fell back to strings (e.g. an unparseable value)
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
             df['date'] = pd.to_datetime(df['date'], format='mixed', errors='coerce')
 
-        # Apply predefined dtype optimizations
-        for col, dtype in self.DTYPE_MAP.items():
+        # Apply predefined dtype optimizations; columns already in their
+        # target dtype (e.g. float64 coordinates) are left untouched
+        for col, dtype in self.NUMERIC_DTYPES.items():
+            if col in df.columns and df[col].dtype != dtype:
+                df[col] = self._parse_numeric(df[col], dtype)
+
+        for col in self.CATEGORY_COLUMNS:
             if col in df.columns:
                 try:
-                    if dtype in ['float32', 'float64']:
-                        # Use pd.to_numeric for numeric columns to handle errors gracefully
-                        df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
-                    else:
-                        df[col] = df[col].astype(dtype)
+                    df[col] = df[col].astype(self._shared_category_dtype(col, df[col]))
                 except Exception as e:
-                    logger.warning(f"Failed to convert {col} to {dtype}: {e}")
+                    logger.warning(f"Failed to convert {col} to category: {e}")
 
         return df
 
+    @staticmethod
+    def _parse_numeric(series: pd.Series, dtype: str) -> pd.Series:
+        """
+        Convert a CSV column into the target float dtype.
+
+        Columns the C parser already read as numbers are simply downcast.
+        String columns are cast with astype(), which runs NumPy's compiled
+        string-to-float parser in a single pass; only columns containing
+        non-numeric tokens fall back to pd.to_numeric, which coerces
+        invalid cells to NaN.
+
+        Args:
+            series: Column as read from CSV (numeric, or strings when it
+                contains non-numeric tokens)
+            dtype: Target float dtype ('float32' or 'float64')
+
+        Returns:
+            Parsed numeric column
+        """
+        try:
+            return series.astype(dtype)
+        except (ValueError, TypeError):
+            return pd.to_numeric(series, errors='coerce').astype(dtype)
+
+    def _shared_category_dtype(self, col: str, values: pd.Series) -> pd.CategoricalDtype:
+        """
+        Get the categorical dtype for a column, extended with unseen values.
+
+        All chunks share one category list per column, and new values are
+        only ever appended. Earlier codes therefore stay valid, and Arrow
+        writes the same dictionary mapping for every chunk instead of
+        building an unrelated dictionary each time.
+
+        Args:
+            col: Column name
+            values: Column values of the current chunk
+
+        Returns:
+            Categorical dtype covering all values seen so far
+        """
+        dtype = self._category_dtypes.get(col)
+        chunk_values = pd.Index(values.dropna().unique())
+
+        if dtype is None:
+            dtype = pd.CategoricalDtype(chunk_values)
+        else:
+            unseen = chunk_values[~chunk_values.isin(dtype.categories)]
+            if len(unseen) > 0:
+                dtype = pd.CategoricalDtype(dtype.categories.append(unseen))
+
+        self._category_dtypes[col] = dtype
+        return dtype
+
     def _add_partition_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Add partition columns for efficient data organization.
 
-        Extracts year from the date column to enable partitioning.
+        Extracts year and month from the date column to enable partitioning.
+        Month-level partitions let time-range queries skip whole directories
+        instead of scanning every file of a year.
 
         Args:
             df: Input DataFrame with 'date' column
 
         Returns:
-            DataFrame with added 'year' column
+            DataFrame with added 'year' and 'month' columns
         """
         if 'date' in df.columns:
             df['year'] = df['date'].dt.year
+            df['month'] = df['date'].dt.month
         else:
             logger.warning("No 'date' column found, skipping partition columns")
 
@@ -162,7 +232,7 @@ class CSVToParquetConverter:
         1. Reads CSV in chunks to manage memory
         2. Optimizes data types for each chunk
         3. Adds partitioning columns
-        4. Writes to Parquet with year-based partitioning
+        4. Writes to Parquet partitioned by year and month (year=YYYY/month=M)
         5. Tracks and reports statistics
 
         Returns:
@@ -178,19 +248,25 @@ class CSVToParquetConverter:
         logger.info("Starting CSV to Parquet conversion...")
         start_time = datetime.now()
 
-        total_rows = 0
-        partitions_created = set()
-
         try:
             # Initialize Parquet writer (will append chunks)
             parquet_writer = None
             schema = None
 
-            # Read and process CSV in chunks
+            # Files written by this run; output_dir may still hold files
+            # from earlier conversions that must not be counted
+            written_files = []
+
+            # Read and process CSV in chunks. Only categorical columns are
+            # forced to str (so every chunk yields string dictionaries);
+            # numeric columns are parsed by the C engine directly into
+            # float64 and merely downcast in _optimize_datatypes
             chunk_iterator = pd.read_csv(
                 self.csv_path,
                 chunksize=self.chunk_size,
-                dtype={col: str for col in self.DTYPE_MAP.keys() if col != 'date'},
+                dtype={col: str for col in self.CATEGORY_COLUMNS},
+                parse_dates=['date'],
+                date_format='mixed',
                 na_values=['-', '', 'NA', 'N/A', 'null', 'NULL']
             )
 
@@ -201,10 +277,6 @@ class CSVToParquetConverter:
                 # Add partition columns
                 chunk = self._add_partition_columns(chunk)
 
-                # Track partitions
-                if 'year' in chunk.columns:
-                    partitions_created.update(chunk['year'].unique())
-
                 # Convert to PyArrow Table
                 table = pa.Table.from_pandas(chunk)
 
@@ -216,31 +288,48 @@ class CSVToParquetConverter:
                 pq.write_to_dataset(
                     table,
                     root_path=str(self.output_dir),
-                    partition_cols=['year'] if 'year' in chunk.columns else None,
-                    existing_data_behavior='overwrite_or_ignore'
+                    partition_cols=['year', 'month'] if 'year' in chunk.columns else None,
+                    existing_data_behavior='overwrite_or_ignore',
+                    file_visitor=written_files.append
                 )
 
-                total_rows += len(chunk)
-
                 # Log progress
                 if chunk_num % 10 == 0:
                     logger.info(
-                        f"Processed {chunk_num} chunks, "
-                        f"{total_rows:,} rows total"
+                        f"Processed {chunk_num} chunks "
+                        f"(~{chunk_num * self.chunk_size:,} rows)"
                     )
 
-            # Calculate output file size
+            # Row count and output size come from the files written in this
+            # run: the count is taken from each file's Parquet footer, not
+            # tallied per chunk
+            parquet_files = [Path(f.path) for f in written_files]
+            total_rows = sum(f.metadata.num_rows for f in written_files)
             file_size_mb = sum(
-                f.stat().st_size for f in self.output_dir.rglob('*.parquet')
+                f.stat().st_size for f in parquet_files
             ) / (1024 * 1024)
 
+            # Partitions are read back from the hive directory names of the
+            # written files (year=YYYY/month=M/<file>.parquet), instead of
+            # tracking chunk['year'].unique() on every chunk. Rows without a
+            # parseable date land in year=__HIVE_DEFAULT_PARTITION__, which
+            # is not a year
+            partition_values = {
+                f.parent.parent.name.split('=', 1)[1]
+                for f in parquet_files
+                if f.parent.parent.name.startswith('year=')
+            }
+            partitions_created = sorted(
+                int(value) for value in partition_values if value.isdigit()
+            )
+
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
 
             # Prepare statistics
             stats = {
                 'total_rows': total_rows,
-                'partitions': sorted(list(partitions_created)),
+                'partitions': partitions_created,
                 'file_size_mb': round(file_size_mb, 2),
                 'processing_time_seconds': round(processing_time, 2),
                 'output_dir': str(self.output_dir)
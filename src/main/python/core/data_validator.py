@@ -17,9 +17,12 @@ Date: 2025-10-13
 """
 
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import duckdb
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import logging
 
 # Configure logging
@@ -63,6 +66,33 @@ class DataValidator:
 
         logger.info("Data validator initialized")
 
+    @cached_property
+    def _parquet_dataset(self) -> ds.Dataset:
+        """
+        Hive-partitioned Parquet dataset shared by all validation checks.
+
+        File discovery and footer parsing happen once; each check then reads
+        only the columns it needs from this dataset. Only *.parquet files are
+        included, since the default layout keeps the DuckDB database in the
+        same directory.
+
+        Returns:
+            PyArrow dataset over the Parquet files in the directory
+
+        Raises:
+            FileNotFoundError: If the directory contains no Parquet files
+        """
+        parquet_files = sorted(str(p) for p in self.parquet_dir.rglob('*.parquet'))
+        if not parquet_files:
+            raise FileNotFoundError(f"No Parquet files found in {self.parquet_dir}")
+
+        return ds.dataset(
+            parquet_files,
+            format='parquet',
+            partitioning='hive',
+            partition_base_dir=str(self.parquet_dir)
+        )
+
     def validate_all(self) -> Dict[str, Any]:
         """
         Run all validation checks.
@@ -77,15 +107,28 @@ class DataValidator:
         logger.info("Starting Data Validation")
         logger.info("=" * 80)
 
+        # The Parquet checks below only log warnings when they cannot read
+        # the dataset, so an unreadable dataset is caught here
+        try:
+            self._parquet_dataset
+            parquet_error = None
+        except Exception as e:
+            parquet_error = str(e)
+
         results = {
             'row_counts': self._validate_row_counts(),
             'schema': self._validate_schema(),
             'value_ranges': self._validate_value_ranges(),
             'missing_data': self._analyze_missing_data(),
             'statistics': self._compare_statistics(),
+            'parquet_error': parquet_error,
             'validation_passed': True
         }
 
+        if parquet_error is not None:
+            results['validation_passed'] = False
+            logger.error(f"CRITICAL: Could not open Parquet dataset: {parquet_error}")
+
         # Check if any critical validations failed
         if results['row_counts']['match'] == False:
             results['validation_passed'] = False
@@ -124,9 +167,7 @@ class DataValidator:
         # Parquet row count
         if self.parquet_dir.exists():
             try:
-                parquet_pattern = f"{self.parquet_dir}/**/*.parquet"
-                df = pd.read_parquet(parquet_pattern, columns=['date'])
-                parquet_rows = len(df)
+                parquet_rows = self._parquet_dataset.count_rows()
                 row_counts['parquet'] = parquet_rows
                 logger.info(f"Parquet rows: {parquet_rows:,}")
             except Exception as e:
@@ -153,7 +194,7 @@ class DataValidator:
 
         # Check if all counts match
         non_null_counts = [v for v in row_counts.values() if v is not None]
-        row_counts['match'] = len(set(non_null_counts)) <= 1 if non_null_counts else False
+        row_counts['match'] = all(x == non_null_counts[0] for x in non_null_counts) if non_null_counts else False
 
         if row_counts['match']:
             logger.info("✓ Row counts match across all formats")
@@ -184,18 +225,17 @@ class DataValidator:
         # Check Parquet schema
         if self.parquet_dir.exists():
             try:
-                parquet_pattern = f"{self.parquet_dir}/**/*.parquet"
-                df = pd.read_parquet(parquet_pattern, columns=None)
-                parquet_columns = df.columns.tolist()
+                parquet_columns = self._parquet_dataset.schema.names
 
                 # Remove partition columns that were added
-                parquet_columns = [c for c in parquet_columns if not c.startswith('year')]
+                partition_columns = {'year', 'month'}
+                parquet_columns = [c for c in parquet_columns if c not in partition_columns]
 
                 schema_info['parquet_columns'] = parquet_columns
                 schema_info['parquet_column_count'] = len(parquet_columns)
 
                 missing = set(expected_columns) - set(parquet_columns)
-                extra = set(parquet_columns) - set(expected_columns) - {'year'}
+                extra = set(parquet_columns) - set(expected_columns)
 
                 if not missing and not extra:
                     logger.info("✓ Parquet schema matches expected columns")
@@ -234,18 +274,16 @@ class DataValidator:
         }
 
         try:
-            # Load sample data from Parquet
+            # Read min/max from Parquet footers instead of scanning values
             if self.parquet_dir.exists():
-                parquet_pattern = f"{self.parquet_dir}/**/*.parquet"
-                df = pd.read_parquet(
-                    parquet_pattern,
-                    columns=list(expected_ranges.keys())
+                available = set(self._parquet_dataset.schema.names)
+                column_ranges = self._column_min_max(
+                    [c for c in expected_ranges if c in available]
                 )
 
                 for column, (min_val, max_val) in expected_ranges.items():
-                    if column in df.columns:
-                        actual_min = df[column].min()
-                        actual_max = df[column].max()
+                    if column in column_ranges:
+                        actual_min, actual_max = column_ranges[column]
 
                         in_range = (
                             (pd.isna(actual_min) or actual_min >= min_val) and
@@ -271,6 +309,51 @@ class DataValidator:
 
         return range_checks
 
+    def _column_min_max(self, columns: List[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Get global min/max per column from Parquet row-group statistics.
+
+        Only file footers are read. Columns with any row group lacking
+        min/max statistics (while holding non-null values) are computed
+        from the data instead.
+
+        Args:
+            columns: Column names to inspect
+
+        Returns:
+            Dictionary mapping column name to (min, max); NaN if all null
+        """
+        bounds = {col: [None, None] for col in columns}
+        needs_scan = set()
+
+        for fragment in self._parquet_dataset.get_fragments():
+            metadata = fragment.metadata
+            names = metadata.schema.names
+            for rg in range(metadata.num_row_groups):
+                row_group = metadata.row_group(rg)
+                for col in columns:
+                    if col not in names or col in needs_scan:
+                        continue
+                    chunk = row_group.column(names.index(col))
+                    stats = chunk.statistics
+                    if stats is not None and stats.has_min_max:
+                        lo, hi = bounds[col]
+                        bounds[col][0] = stats.min if lo is None else min(lo, stats.min)
+                        bounds[col][1] = stats.max if hi is None else max(hi, stats.max)
+                    elif stats is None or stats.null_count != row_group.num_rows:
+                        needs_scan.add(col)
+
+        if needs_scan:
+            table = self._parquet_dataset.to_table(columns=sorted(needs_scan))
+            for col in needs_scan:
+                minmax = pc.min_max(table[col]).as_py()
+                bounds[col] = [minmax['min'], minmax['max']]
+
+        return {
+            col: tuple(float('nan') if v is None else float(v) for v in bounds[col])
+            for col in columns
+        }
+
     def _analyze_missing_data(self) -> Dict[str, Any]:
         """
         Analyze missing data patterns.
@@ -284,11 +367,18 @@ class DataValidator:
 
         try:
             if self.parquet_dir.exists():
-                parquet_pattern = f"{self.parquet_dir}/**/*.parquet"
-                df = pd.read_parquet(parquet_pattern)
-
-                total_rows = len(df)
-                missing_counts = df.isnull().sum()
+                # Accumulate null counts batch by batch so peak memory stays
+                # at one record batch regardless of dataset size
+                dataset = self._parquet_dataset
+                null_counts = dict.fromkeys(dataset.schema.names, 0)
+                total_rows = 0
+                for batch in dataset.to_batches(batch_size=128_000):
+                    total_rows += batch.num_rows
+                    for name, column in zip(batch.schema.names, batch.columns):
+                        nulls = pc.sum(pc.is_null(column, nan_is_null=True)).as_py()
+                        null_counts[name] += nulls or 0
+
+                missing_counts = pd.Series(null_counts, dtype='int64')
                 missing_percentages = (missing_counts / total_rows * 100).round(2)
 
                 # Report columns with >5% missing data
@@ -323,12 +413,14 @@ class DataValidator:
 
         try:
             if self.parquet_dir.exists():
-                parquet_pattern = f"{self.parquet_dir}/**/*.parquet"
-                df = pd.read_parquet(parquet_pattern)
-
                 # Calculate statistics for key metrics
                 key_metrics = ['aqi', 'pm2.5', 'pm10', 'o3']
 
+                available = set(self._parquet_dataset.schema.names)
+                df = self._parquet_dataset.to_table(
+                    columns=[m for m in key_metrics if m in available]
+                ).to_pandas()
+
                 for metric in key_metrics:
                     if metric in df.columns:
                         stats_comparison[metric] = {
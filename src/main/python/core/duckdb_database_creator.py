@@ -8,7 +8,7 @@ analytical workloads on air quality data.
 Features:
 - Import Parquet files into DuckDB
 - Create indexes for optimized queries
-- Define views for common query patterns
+- Materialize summary tables and views for common query patterns
 - SQL query interface
 - Zero-copy Parquet integration
 
@@ -17,9 +17,11 @@ Date: 2025-10-13
 """
 
 import duckdb
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
+import re
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +30,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Hive directory value for rows whose partition key is NULL (e.g. rows
+# whose date could not be parsed)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# Hive year directory in a Parquet file path, e.g. ".../year=2024/..."
+YEAR_PARTITION_PATTERN = re.compile(rf'[\\/]year=(\d+|{NULL_PARTITION})[\\/]')
+
 
 class DuckDBDatabaseCreator:
     """
@@ -42,10 +51,33 @@ class DuckDBDatabaseCreator:
         connection: Active DuckDB connection
     """
 
+    # Pre-aggregated roll-up tables, ordered from coarsest to finest grain.
+    # Each maps to the grouping keys it stores.
+    AGGREGATE_CUBE = {
+        'agg_county': ['county'],
+        'agg_county_year': ['county', 'year'],
+        'agg_county_year_month': ['county', 'year', 'month'],
+        'agg_station_day': ['sitename', 'county', 'date'],
+    }
+
+    # Rows kept in the pre-sorted high_pollution_events table
+    HIGH_POLLUTION_TOP_K = 10000
+
+    # Measures stored in every cube table (output prefix -> source column)
+    CUBE_MEASURES = {
+        'aqi': 'aqi',
+        'pm25': '"pm2.5"',
+        'pm10': 'pm10',
+        'o3': 'o3',
+    }
+
     def __init__(
         self,
         db_path: str,
-        parquet_dir: str
+        parquet_dir: str,
+        memory_limit: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+        force_compression: Optional[str] = None
     ):
         """
         Initialize the database creator.
@@ -53,9 +85,18 @@ class DuckDBDatabaseCreator:
         Args:
             db_path: Path where the DuckDB database will be created
             parquet_dir: Directory containing Parquet files to import
+            memory_limit: DuckDB memory limit for the import, e.g. '4GB'
+                (default: DuckDB's own limit)
+            temp_directory: Directory DuckDB may spill to when the limit is
+                reached (default: DuckDB's own temp directory)
+            force_compression: Storage compression to force for every
+                column, e.g. 'zstd' (default: DuckDB picks per segment)
         """
         self.db_path = Path(db_path)
         self.parquet_dir = Path(parquet_dir)
+        self.memory_limit = memory_limit
+        self.temp_directory = temp_directory
+        self.force_compression = force_compression
         self.connection: Optional[duckdb.DuckDBPyConnection] = None
 
         # Validate parquet directory exists
@@ -72,9 +113,9 @@ class DuckDBDatabaseCreator:
 
         This method:
         1. Creates a new database connection
-        2. Creates main air_quality table from Parquet files
+        2. Creates one table per year and an air_quality view over them
         3. Creates indexes for performance
-        4. Creates helpful views
+        4. Materializes summary tables and creates helpful views
         5. Returns statistics about the created database
 
         Returns:
@@ -82,6 +123,9 @@ class DuckDBDatabaseCreator:
             - table_count: Number of rows in the main table
             - indexes_created: List of created indexes
             - views_created: List of created views
+            - tables_materialized: List of materialized summary tables
+            - aggregate_tables: List of roll-up cube tables
+            - partition_tables: List of per-year tables behind air_quality
 
         Raises:
             Exception: If database creation fails
@@ -92,35 +136,54 @@ class DuckDBDatabaseCreator:
             # Create database connection
             self.connection = duckdb.connect(str(self.db_path))
 
+            # Let the import stream row groups out of order and spill to
+            # disk instead of buffering the whole scan in memory
+            self.connection.execute("SET preserve_insertion_order = false")
+            if self.memory_limit:
+                self.connection.execute(
+                    "SET memory_limit = ?", [self.memory_limit]
+                )
+            if self.temp_directory:
+                self.connection.execute(
+                    "SET temp_directory = ?", [self.temp_directory]
+                )
+            if self.force_compression:
+                self.connection.execute(
+                    "SET force_compression = ?", [self.force_compression]
+                )
+
             # Import Parquet files into main table
             logger.info("Importing Parquet files...")
-            parquet_files = list(self.parquet_dir.rglob("*.parquet"))
+            # List the files with DuckDB's native glob rather than a
+            # Python directory walk
+            parquet_files = [
+                row[0] for row in self.connection.execute(
+                    "SELECT file FROM glob(?)",
+                    [f"{self.parquet_dir}/**/*.parquet"]
+                ).fetchall()
+            ]
 
             if not parquet_files:
                 raise FileNotFoundError(
                     f"No Parquet files found in {self.parquet_dir}"
                 )
 
-            # Create main table from all Parquet files
-            # DuckDB can read partitioned parquet directly
-            parquet_path = f"{self.parquet_dir}/**/*.parquet"
-
-            self.connection.execute(f"""
-                CREATE TABLE air_quality AS
-                SELECT * FROM read_parquet('{parquet_path}', hive_partitioning=true)
-            """)
-
-            # Get row count
-            row_count = self.connection.execute(
-                "SELECT COUNT(*) FROM air_quality"
-            ).fetchone()[0]
+            # Create one table per year partition behind an air_quality view
+            # (CREATE TABLE AS reports its row count, so no extra scan)
+            partition_tables, row_count = self._import_year_partitions(
+                parquet_files
+            )
 
-            logger.info(f"Imported {row_count:,} rows into air_quality table")
+            logger.info(f"Imported {row_count:,} rows into air_quality")
 
             # Create indexes for performance
-            indexes_created = self._create_indexes()
+            indexes_created = self._create_indexes(
+                partition_tables or ['air_quality']
+            )
 
-            # Create helpful views
+            # Materialize aggregate tables and create helpful views
+            tables_materialized = self._create_summary_tables()
+            aggregate_tables = self._create_aggregate_cube()
             views_created = self._create_views()
 
             # Collect statistics
@@ -128,6 +191,9 @@ class DuckDBDatabaseCreator:
                 'table_count': row_count,
                 'indexes_created': indexes_created,
                 'views_created': views_created,
+                'tables_materialized': tables_materialized,
+                'aggregate_tables': aggregate_tables,
+                'partition_tables': partition_tables,
                 'db_path': str(self.db_path),
                 'parquet_files_count': len(parquet_files)
             }
@@ -141,50 +207,432 @@ class DuckDBDatabaseCreator:
             logger.error(f"Database creation failed: {e}")
             raise
 
-    def _create_indexes(self) -> List[str]:
+    def _import_year_partitions(
+        self,
+        parquet_files: List[str]
+    ) -> Tuple[List[str], int]:
+        """
+        Import each year partition into its own table.
+
+        Every ``year=YYYY`` directory becomes an ``air_quality_yYYYY`` table
+        and ``air_quality`` is a UNION ALL view over them, so a query with
+        ``WHERE year = ...`` only scans the matching year's table. Rows in
+        the null-year partition (``year=__HIVE_DEFAULT_PARTITION__``) go to
+        ``air_quality_ynull`` with a NULL year. Rows are
+        loaded sorted by date so date-range filters can skip row groups by
+        their min/max statistics, and date/year/month are cast once to
+        compact types (TIMESTAMP, SMALLINT, TINYINT) so later queries do
+        not convert them per row. Falls back to a single air_quality table
+        when the files are not year-partitioned.
+
+        Args:
+            parquet_files: Parquet files found under the parquet directory
+
+        Returns:
+            Tuple of (created per-year table names, total rows imported)
+
+        Raises:
+            RuntimeError: If the imported row count differs from the row
+                count in the Parquet file footers
+        """
+        partitions = {
+            match.group(1)
+            for match in map(YEAR_PARTITION_PATTERN.search, parquet_files)
+            if match
+        }
+        years = sorted(int(value) for value in partitions if value != NULL_PARTITION)
+        if NULL_PARTITION in partitions:
+            years.append(None)
+
+        if not years:
+            # DuckDB can read partitioned parquet directly
+            parquet_path = f"{self.parquet_dir}/**/*.parquet"
+            row_count = self.connection.execute("""
+                CREATE TABLE air_quality AS
+                SELECT * REPLACE (CAST(date AS TIMESTAMP) AS date)
+                FROM read_parquet(?, hive_partitioning=true)
+                ORDER BY date
+            """, [parquet_path]).fetchone()[0]
+            self._check_imported_rows(parquet_files, row_count)
+            return [], row_count
+
+        tables = []
+        row_count = 0
+
+        for year in years:
+            if year is None:
+                table = "air_quality_ynull"
+                parquet_path = f"{self.parquet_dir}/year={NULL_PARTITION}/**/*.parquet"
+            else:
+                table = f"air_quality_y{year}"
+                parquet_path = f"{self.parquet_dir}/year={year}/**/*.parquet"
+            row_count += self.connection.execute(f"""
+                CREATE TABLE {table} AS
+                SELECT * REPLACE (
+                    CAST(date AS TIMESTAMP) AS date,
+                    CAST(year AS SMALLINT) AS year,
+                    CAST(month AS TINYINT) AS month
+                )
+                FROM read_parquet(?, hive_partitioning=true)
+                ORDER BY date
+            """, [parquet_path]).fetchone()[0]
+            tables.append(table)
+            logger.info(f"Imported partition table: {table}")
+
+        union = "\nUNION ALL BY NAME\n".join(
+            f"SELECT * FROM {table}" for table in tables
+        )
+        self.connection.execute(f"CREATE VIEW air_quality AS {union}")
+
+        self._check_imported_rows(parquet_files, row_count)
+        return tables, row_count
+
+    def _check_imported_rows(self, parquet_files: List[str], row_count: int):
+        """
+        Verify that every Parquet row was imported.
+
+        Files outside the recognized partition directories would be left
+        out of the per-year tables without an error, so the imported total
+        is compared with the row counts stored in the file footers.
+
+        Args:
+            parquet_files: Parquet files found under the parquet directory
+            row_count: Total rows imported into the air_quality tables
+
+        Raises:
+            RuntimeError: If the two row counts differ
+        """
+        parquet_rows = self.connection.execute(
+            "SELECT SUM(num_rows) FROM parquet_file_metadata(?)",
+            [parquet_files]
+        ).fetchone()[0]
+
+        if parquet_rows != row_count:
+            raise RuntimeError(
+                f"Imported {row_count:,} rows but the Parquet files "
+                f"hold {parquet_rows:,}"
+            )
+
+    def _create_indexes(self, tables: List[str]) -> List[str]:
         """
-        Create indexes for optimized query performance.
+        Create ART indexes for station lookups.
 
-        Creates indexes on commonly queried columns:
-        - date (for time-range queries)
+        Only the high-cardinality station columns are indexed:
         - sitename (for station-specific queries)
-        - county (for regional queries)
+        - siteid (for station ID lookups)
+
+        date, county and year are left to DuckDB's min/max zone maps, which
+        are tight because each table is loaded sorted by date.
+
+        Args:
+            tables: Tables holding the air_quality rows
 
         Returns:
-            List of created index names
+            List of indexed column names
         """
         logger.info("Creating indexes...")
 
         indexes = [
-            ("idx_date", "date"),
             ("idx_sitename", "sitename"),
-            ("idx_county", "county"),
-            ("idx_year", "year")
+            ("idx_siteid", "siteid")
         ]
 
         created_indexes = []
 
         for idx_name, column in indexes:
             try:
-                # Note: DuckDB doesn't have traditional CREATE INDEX
-                # but it automatically optimizes queries on these columns
-                # We'll just log this for documentation
-                logger.info(f"Query optimization available on: {column}")
+                for table in tables:
+                    self.connection.execute(
+                        f"CREATE INDEX {idx_name}_{table} ON {table} ({column})"
+                    )
                 created_indexes.append(column)
+                logger.info(f"Created index on: {column}")
             except Exception as e:
-                logger.warning(f"Failed to optimize {column}: {e}")
+                logger.warning(f"Failed to create index on {column}: {e}")
 
         return created_indexes
 
+    def _materialize_parallel(
+        self,
+        statements: Dict[str, List[str]],
+        kind: str
+    ) -> List[str]:
+        """
+        Build several tables concurrently, one cursor per table.
+
+        Each table's statements run in order on their own cursor of the
+        shared database, so independent CREATE TABLE AS scans overlap
+        instead of running one after another. A failing table is logged
+        and skipped without affecting the others.
+
+        Args:
+            statements: Table name -> SQL statements that build it
+            kind: Description used in log messages
+
+        Returns:
+            List of successfully built table names, in input order
+        """
+        def build(sqls: List[str]):
+            cursor = self.connection.cursor()
+            try:
+                for sql in sqls:
+                    cursor.execute(sql)
+            finally:
+                cursor.close()
+
+        if not statements:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(statements)) as executor:
+            futures = {
+                name: executor.submit(build, sqls)
+                for name, sqls in statements.items()
+            }
+
+        tables = []
+
+        for name, future in futures.items():
+            try:
+                future.result()
+                tables.append(name)
+                logger.info(f"Created {kind}: {name}")
+            except Exception as e:
+                logger.warning(f"Failed to create {kind} {name}: {e}")
+
+        return tables
+
+    def _create_summary_tables(self) -> List[str]:
+        """
+        Materialize aggregate tables for common query patterns.
+
+        The aggregates are stored as tables rather than views so that
+        dashboard queries read a small pre-grouped table instead of
+        re-scanning and re-grouping air_quality on every request:
+        - Monthly sums and counts by county
+        - Top AQI > 100 events, sorted by AQI descending
+        - Station metadata
+
+        Returns:
+            List of materialized table names
+        """
+        logger.info("Materializing summary tables...")
+
+        statements = {
+            # Table 1: Monthly sums and counts by county (the
+            # monthly_summary view derives averages from these)
+            'monthly_summary_raw': [
+                """
+                CREATE TABLE monthly_summary_raw AS
+                SELECT
+                    year,
+                    month,
+                    county,
+                    SUM(aqi) as aqi_sum,
+                    COUNT(aqi) as aqi_count,
+                    MAX(aqi) as max_aqi,
+                    MIN(aqi) as min_aqi,
+                    SUM("pm2.5") as pm25_sum,
+                    COUNT("pm2.5") as pm25_count,
+                    COUNT(*) as measurement_count,
+                    COUNT(DISTINCT sitename) as station_count
+                FROM air_quality
+                GROUP BY year, month, county
+                """,
+                "CREATE INDEX idx_monthly_summary_county_month "
+                "ON monthly_summary_raw (county, month)"
+            ],
+            # Table 2: Worst pollution events (AQI > 100), pre-sorted
+            'high_pollution_events': [
+                f"""
+                CREATE TABLE high_pollution_events AS
+                SELECT
+                    date,
+                    year,
+                    sitename,
+                    county,
+                    aqi,
+                    pollutant,
+                    status,
+                    "pm2.5",
+                    pm10,
+                    o3
+                FROM air_quality
+                WHERE aqi > 100
+                ORDER BY aqi DESC
+                LIMIT {self.HIGH_POLLUTION_TOP_K}
+                """
+            ],
+            # Table 3: Station metadata
+            'station_metadata': [
+                """
+                CREATE TABLE station_metadata AS
+                SELECT
+                    sitename,
+                    county,
+                    siteid,
+                    longitude,
+                    latitude,
+                    MIN(date) as first_measurement,
+                    MAX(date) as last_measurement
+                FROM air_quality
+                GROUP BY sitename, county, siteid, longitude, latitude
+                """
+            ],
+        }
+
+        return self._materialize_parallel(statements, "summary table")
+
+    def _create_aggregate_cube(self) -> List[str]:
+        """
+        Materialize roll-up tables at several grouping grains.
+
+        Each table stores SUM, sum of squares and non-null COUNT per measure
+        rather than averages, so any coarser grouping can be computed from
+        a finer table by summing again. Only the finest grains are built
+        from air_quality; the coarser county tables are rolled up from
+        agg_county_year_month, so the base table is scanned twice rather
+        than once per cube table. The ``date`` key of agg_station_day is
+        the calendar day.
+
+        Returns:
+            List of created aggregate table names
+        """
+        logger.info("Creating aggregate cube...")
+
+        base_measures = ",\n".join(
+            f"SUM({col}) as {name}_sum, "
+            f"SUM({col} * {col}) as {name}_sumsq, "
+            f"COUNT({col}) as {name}_count"
+            for name, col in self.CUBE_MEASURES.items()
+        )
+        rollup_measures = ",\n".join(
+            f"SUM({name}_{stat}) as {name}_{stat}"
+            for name in self.CUBE_MEASURES
+            for stat in ('sum', 'sumsq', 'count')
+        )
+        key_exprs = {
+            'county': 'county',
+            'sitename': 'sitename',
+            'year': 'year',
+            'month': 'month',
+            'date': "DATE_TRUNC('day', date)",
+        }
+
+        # Coarse tables derived from a finer cube table instead of the base
+        rollup_sources = {
+            'agg_county': 'agg_county_year_month',
+            'agg_county_year': 'agg_county_year_month',
+        }
+
+        # Extra ART indexes for point lookups on the finer grains
+        indexes = {'agg_station_day': 'sitename, date'}
+
+        base_statements = {}
+        rollup_statements = {}
+
+        for table, keys in self.AGGREGATE_CUBE.items():
+            if table in rollup_sources:
+                group_keys = ", ".join(keys)
+                rollup_statements[table] = [f"""
+                    CREATE TABLE {table} AS
+                    SELECT
+                        {group_keys},
+                        SUM(row_count) as row_count,
+                        {rollup_measures}
+                    FROM {rollup_sources[table]}
+                    GROUP BY {group_keys}
+                """]
+                continue
+
+            select_keys = ", ".join(f"{key_exprs[k]} as {k}" for k in keys)
+            group_keys = ", ".join(key_exprs[k] for k in keys)
+            base_statements[table] = [f"""
+                CREATE TABLE {table} AS
+                SELECT
+                    {select_keys},
+                    COUNT(*) as row_count,
+                    {base_measures}
+                FROM air_quality
+                GROUP BY {group_keys}
+            """]
+            if table in indexes:
+                base_statements[table].append(
+                    f"CREATE INDEX idx_{table} ON {table} ({indexes[table]})"
+                )
+
+        created = self._materialize_parallel(base_statements, "aggregate table")
+        created += self._materialize_parallel(
+            {
+                table: sqls for table, sqls in rollup_statements.items()
+                if rollup_sources[table] in created
+            },
+            "aggregate table"
+        )
+
+        # Report in cube order (coarsest first), as query_best_agg uses it
+        return [table for table in self.AGGREGATE_CUBE if table in created]
+
+    def query_best_agg(self, grouping_keys: List[str]) -> Any:
+        """
+        Aggregate the measures over the given keys using the smallest cube.
+
+        Picks the first (coarsest) cube table whose keys cover the request
+        and rolls it up; falls back to scanning air_quality when no cube
+        covers the requested keys.
+
+        Args:
+            grouping_keys: Columns to group by, e.g. ['county', 'year']
+
+        Returns:
+            Query results as DuckDB relation with the grouping keys,
+            row_count and avg_<measure> columns
+
+        Raises:
+            RuntimeError: If database connection is not established
+        """
+        if not self.connection:
+            raise RuntimeError("Database not connected. Call create_database() first.")
+
+        keys = ", ".join(f'"{k}"' for k in grouping_keys)
+        source = next(
+            (
+                table for table, table_keys in self.AGGREGATE_CUBE.items()
+                if set(grouping_keys) <= set(table_keys)
+            ),
+            None
+        )
+
+        if source is not None:
+            measures = ", ".join(
+                f"SUM({name}_sum) / NULLIF(SUM({name}_count), 0) as avg_{name}"
+                for name in self.CUBE_MEASURES
+            )
+            row_count = "CAST(SUM(row_count) AS BIGINT) as row_count"
+        else:
+            source = "air_quality"
+            measures = ", ".join(
+                f"AVG({col}) as avg_{name}"
+                for name, col in self.CUBE_MEASURES.items()
+            )
+            row_count = "COUNT(*) as row_count"
+
+        logger.debug(f"Serving group by {grouping_keys} from {source}")
+
+        select_list = f"{keys}, {row_count}" if keys else row_count
+        group_by = f"GROUP BY {keys}" if keys else ""
+
+        return self.connection.execute(
+            f"SELECT {select_list}, {measures} FROM {source} {group_by}"
+        )
+
     def _create_views(self) -> List[str]:
         """
         Create helpful views for common query patterns.
 
         Creates views for:
-        - Daily averages by station
-        - Monthly summaries by county
-        - High pollution events
-        - Station metadata
+        - Daily averages by station (from agg_station_day sums/counts)
+        - Monthly summaries by county (from monthly_summary_raw)
+        - All high pollution events (unsorted, for full scans)
 
         Returns:
             List of created view names
@@ -198,16 +646,15 @@ class DuckDBDatabaseCreator:
             self.connection.execute("""
                 CREATE VIEW daily_averages AS
                 SELECT
-                    DATE_TRUNC('day', date) as date,
+                    date,
                     sitename,
                     county,
-                    AVG(aqi) as avg_aqi,
-                    AVG(pm2_5) as avg_pm25,
-                    AVG(pm10) as avg_pm10,
-                    AVG(o3) as avg_o3,
-                    COUNT(*) as measurement_count
-                FROM air_quality
-                GROUP BY DATE_TRUNC('day', date), sitename, county
+                    aqi_sum / NULLIF(aqi_count, 0) as avg_aqi,
+                    pm25_sum / NULLIF(pm25_count, 0) as avg_pm25,
+                    pm10_sum / NULLIF(pm10_count, 0) as avg_pm10,
+                    o3_sum / NULLIF(o3_count, 0) as avg_o3,
+                    row_count as measurement_count
+                FROM agg_station_day
             """)
             views.append("daily_averages")
             logger.info("Created view: daily_averages")
@@ -220,64 +667,43 @@ class DuckDBDatabaseCreator:
                 CREATE VIEW monthly_summary AS
                 SELECT
                     year,
-                    MONTH(date) as month,
+                    month,
                     county,
-                    AVG(aqi) as avg_aqi,
-                    MAX(aqi) as max_aqi,
-                    MIN(aqi) as min_aqi,
-                    AVG(pm2_5) as avg_pm25,
-                    COUNT(*) as measurement_count,
-                    COUNT(DISTINCT sitename) as station_count
-                FROM air_quality
-                GROUP BY year, MONTH(date), county
+                    aqi_sum / NULLIF(aqi_count, 0) as avg_aqi,
+                    max_aqi,
+                    min_aqi,
+                    pm25_sum / NULLIF(pm25_count, 0) as avg_pm25,
+                    measurement_count,
+                    station_count
+                FROM monthly_summary_raw
             """)
             views.append("monthly_summary")
             logger.info("Created view: monthly_summary")
         except Exception as e:
             logger.warning(f"Failed to create monthly_summary view: {e}")
 
-        # View 3: High pollution events (AQI > 100)
+        # View 3: All high pollution events (AQI > 100)
         try:
             self.connection.execute("""
-                CREATE VIEW high_pollution_events AS
+                CREATE VIEW high_pollution_events_full AS
                 SELECT
                     date,
+                    year,
                     sitename,
                     county,
                     aqi,
                     pollutant,
                     status,
-                    pm2_5,
+                    "pm2.5",
                     pm10,
                     o3
                 FROM air_quality
                 WHERE aqi > 100
-                ORDER BY aqi DESC
-            """)
-            views.append("high_pollution_events")
-            logger.info("Created view: high_pollution_events")
-        except Exception as e:
-            logger.warning(f"Failed to create high_pollution_events view: {e}")
-
-        # View 4: Station metadata
-        try:
-            self.connection.execute("""
-                CREATE VIEW station_metadata AS
-                SELECT DISTINCT
-                    sitename,
-                    county,
-                    siteid,
-                    longitude,
-                    latitude,
-                    MIN(date) as first_measurement,
-                    MAX(date) as last_measurement
-                FROM air_quality
-                GROUP BY sitename, county, siteid, longitude, latitude
             """)
-            views.append("station_metadata")
-            logger.info("Created view: station_metadata")
+            views.append("high_pollution_events_full")
+            logger.info("Created view: high_pollution_events_full")
         except Exception as e:
-            logger.warning(f"Failed to create station_metadata view: {e}")
+            logger.warning(f"Failed to create high_pollution_events_full view: {e}")
 
         return views
 
@@ -310,7 +736,9 @@ class DuckDBDatabaseCreator:
 
 def create_air_quality_database(
     parquet_dir: str = "data/processed",
-    db_path: str = "data/processed/air_quality.duckdb"
+    db_path: str = "data/processed/air_quality.duckdb",
+    memory_limit: Optional[str] = None,
+    force_compression: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Convenience function to create DuckDB database from Parquet files.
@@ -318,6 +746,9 @@ def create_air_quality_database(
     Args:
         parquet_dir: Directory containing Parquet files (default: "data/processed")
         db_path: Path for the DuckDB database (default: "data/processed/air_quality.duckdb")
+        memory_limit: DuckDB memory limit for the import, e.g. '4GB' (default: None)
+        force_compression: Storage compression to force for every column,
+            e.g. 'zstd' (default: None, DuckDB picks per segment)
 
     Returns:
         Dictionary containing database statistics
@@ -326,7 +757,12 @@ def create_air_quality_database(
         >>> stats = create_air_quality_database()
         >>> print(f"Database created with {stats['table_count']:,} rows")
     """
-    creator = DuckDBDatabaseCreator(db_path, parquet_dir)
+    creator = DuckDBDatabaseCreator(
+        db_path,
+        parquet_dir,
+        memory_limit=memory_limit,
+        force_compression=force_compression
+    )
     stats = creator.create_database()
     creator.close()
 
@@ -352,6 +788,7 @@ if __name__ == "__main__":
         print(f"Total rows: {stats['table_count']:,}")
         print(f"Indexes created: {', '.join(stats['indexes_created'])}")
         print(f"Views created: {', '.join(stats['views_created'])}")
+        print(f"Tables materialized: {', '.join(stats['tables_materialized'])}")
         print(f"Database path: {stats['db_path']}")
         print("=" * 80)
 
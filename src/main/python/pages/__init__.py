@@ -19,18 +19,36 @@ Pages Module for Air Quality Streamlit Application
 
 This module contains available page implementations for the DIKW hierarchy.
 
+Page modules are imported lazily on first attribute access (PEP 562), so
+loading the package does not pull in every page's dependencies; only the
+page actually rendered is imported.
+
 Note:
 - Pages 4 and 5 (Wisdom Decision, Prediction Model) are temporarily hidden
-  from the UI and not exported here to avoid accidental imports in runtime.
-  To re-enable, import and add them back to __all__.
+  from the UI and not exported in __all__. To re-enable, add them back to
+  __all__.
 """
 
-from . import page1_data_overview
-from . import page2_statistical_analysis
-from . import page3_pattern_discovery
+import importlib
+
+_LAZY_PAGES = {
+    'page1_data_overview',
+    'page2_statistical_analysis',
+    'page3_pattern_discovery',
+    'page4_wisdom_decision',
+    'page5_prediction_model',
+}
 
 __all__ = [
     'page1_data_overview',
     'page2_statistical_analysis',
     'page3_pattern_discovery'
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_PAGES:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
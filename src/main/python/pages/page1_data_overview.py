@@ -14,6 +14,318 @@ Date: 2025-10-14
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from typing import Any, Callable, Dict, Tuple
+
+from utils.app_utils import DATAFRAME_CACHE, memo_figure
+
+# Shared layout for the per-county horizontal bar charts
+_BAR_LAYOUT = dict(height=400, showlegend=False)
+
+# Fields shown for the example record in the dimension-label expander
+_SAMPLE_FIELDS = (
+    'county', 'region', 'sitename',
+    'aqi', 'aqi_level', 'pollutant',
+    'wind_level', 'time_period', 'is_weekend',
+    'year', 'season', 'yq'
+)
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _summary_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the headline counts shown in the data summary.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Dictionary with station/county counts and the date range
+    """
+    return {
+        'stations': df['sitename'].nunique(),
+        'counties': df['county'].nunique(),
+        'date_min': df['date'].min(),
+        'date_max': df['date'].max(),
+    }
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _missing_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count missing values per column.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        DataFrame with missing count and ratio for columns that have gaps
+    """
+    # One null-mask pass, filtered to columns with missing values before
+    # the table is built
+    nulls = df.isnull().sum()
+    nulls = nulls[nulls > 0]
+
+    return pd.DataFrame({
+        '缺失數': nulls,
+        '缺失比例(%)': (nulls * (100.0 / len(df))).round(2)
+    })
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _station_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Count distinct stations per county, largest first.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Series of station counts indexed by county
+    """
+    # Dedupe the (county, station) pairs first so the count is a plain
+    # group size instead of a per-group hash set
+    pairs = df[['county', 'sitename']].dropna().drop_duplicates()
+    return pairs.groupby('county', sort=False, observed=True).size().sort_values(ascending=False)
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _record_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Count records per county, largest first.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Series of record counts indexed by county
+    """
+    # value_counts is the single-column fast path and already sorts descending
+    return df['county'].value_counts()
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _numeric_describe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Describe the numeric columns.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Transposed describe() table rounded to 2 decimals (empty if the
+        frame has no numeric columns)
+    """
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    if not numeric_cols:
+        return pd.DataFrame()
+
+    return df[numeric_cols].describe().T.round(2)
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _dtype_table(df: pd.DataFrame, with_cardinality: bool = False) -> pd.DataFrame:
+    """
+    Build the column schema table for the data types tab.
+
+    Args:
+        df: Air quality DataFrame
+        with_cardinality: Also count distinct values per column (full scan)
+
+    Returns:
+        DataFrame with column name, dtype (as string for Arrow) and non-null
+        count, plus distinct count when requested
+    """
+    dtypes_df = pd.DataFrame({
+        '欄位名稱': df.columns,
+        # Cast dtype objects to string so the table stays Arrow-compatible
+        '數據類型': df.dtypes.astype(str).values,
+        '非空數量': df.count().values
+    })
+
+    if with_cardinality:
+        dtypes_df['唯一值數量'] = df.nunique().values
+
+    return dtypes_df
+
+
+def _sorted_labels(series: pd.Series) -> list:
+    """
+    List the distinct non-null values of a label column in sorted order.
+
+    Args:
+        series: Label column, categorical or object
+
+    Returns:
+        Sorted list of values present in the series
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Scan the integer codes instead of hashing strings; categories
+        # from astype('category') are already sorted
+        codes = np.unique(series.cat.codes.to_numpy())
+        return series.cat.categories[codes[codes >= 0]].tolist()
+
+    return sorted(series.dropna().unique().tolist())
+
+
+def _label_mask(series: pd.Series, value: Any) -> np.ndarray:
+    """
+    Build a boolean mask of rows whose label equals value.
+
+    Args:
+        series: Label column, categorical or object
+        value: Label to match
+
+    Returns:
+        Boolean NumPy array aligned with the series
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Compare integer codes rather than the label objects
+        categories = series.cat.categories
+        if value not in categories:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == categories.get_loc(value)
+
+    return (series == value).to_numpy()
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _present_values(df: pd.DataFrame, col: str) -> list:
+    """
+    List the values of a label column present in the DataFrame.
+
+    Args:
+        df: Air quality DataFrame
+        col: Label column name
+
+    Returns:
+        Sorted list of present values (empty if the column is missing)
+    """
+    if col not in df.columns:
+        return []
+
+    return _sorted_labels(df[col])
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _present_set(df: pd.DataFrame, col: str) -> frozenset:
+    """
+    Build a membership set of the values of a label column.
+
+    Args:
+        df: Air quality DataFrame
+        col: Label column name
+
+    Returns:
+        Frozen set of present values
+    """
+    return frozenset(_present_values(df, col))
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _sort_order(df: pd.DataFrame, col: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the ascending row order of a column.
+
+    Both directions of a sort option slice the same cached order, so
+    switching between them does not sort again.
+
+    Args:
+        df: Air quality DataFrame
+        col: Column to sort by
+
+    Returns:
+        Tuple of (positions of non-null values in ascending order,
+        positions of missing values)
+    """
+    series = df[col]
+    missing = series.isna().to_numpy()
+    valid = np.flatnonzero(~missing)
+    return valid[np.argsort(series.to_numpy()[valid], kind='stable')], np.flatnonzero(missing)
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _display_rows(df: pd.DataFrame, sort_by: str, num_rows: int) -> pd.DataFrame:
+    """
+    Select the rows shown in the raw-data table.
+
+    Args:
+        df: Air quality DataFrame
+        sort_by: One of the 排序方式 options
+        num_rows: Number of rows to show
+
+    Returns:
+        The top or bottom num_rows records by date or AQI; records with
+        a missing value come last in either direction, as with
+        sort_values(na_position='last')
+    """
+    col = 'date' if sort_by in ("最新記錄", "最舊記錄") else 'aqi'
+    valid_sorted, missing = _sort_order(df, col)
+
+    if sort_by in ("最新記錄", "AQI最高"):
+        valid_sorted = valid_sorted[::-1]
+
+    order = np.concatenate([valid_sorted, missing])[:num_rows]
+    return df.iloc[order]
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _display_csv(df: pd.DataFrame, sort_by: str, num_rows: int) -> bytes:
+    """
+    Serialize the displayed rows for the CSV download button.
+
+    Args:
+        df: Air quality DataFrame
+        sort_by: One of the 排序方式 options
+        num_rows: Number of rows to show
+
+    Returns:
+        UTF-8 (with BOM) encoded CSV bytes
+    """
+    return _display_rows(df, sort_by, num_rows).to_csv(index=False).encode('utf-8-sig')
+
+
+def _county_bar(counts: pd.Series, title: str, value_label: str) -> go.Figure:
+    """
+    Build a horizontal bar chart of per-county counts.
+
+    Args:
+        counts: Series of counts indexed by county
+        title: Chart title
+        value_label: Axis label for the counts
+
+    Returns:
+        Plotly figure
+    """
+    fig = go.Figure(go.Bar(
+        x=counts.to_numpy(),
+        y=counts.index.tolist(),
+        orientation='h',
+        hovertemplate=f'{value_label}=%{{x}}<br>縣市=%{{y}}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=value_label,
+        yaxis_title='縣市',
+        **_BAR_LAYOUT
+    )
+    return fig
+
+
+def _memo_figure(name: str, df: pd.DataFrame, build: Callable[[], go.Figure]) -> go.Figure:
+    """
+    Return a page 1 figure memoized in session_state for the current DataFrame.
+
+    Args:
+        name: Figure name within the page
+        df: Air quality DataFrame the figure is derived from
+        build: Zero-argument callable that builds the figure
+
+    Returns:
+        Plotly figure
+    """
+    return memo_figure(st.session_state, 'page1_figures', name, df, build)
 
 
 def render(df: pd.DataFrame):
@@ -28,9 +340,14 @@ def render(df: pd.DataFrame):
     st.markdown("**問題：這是什麼？** - 查看原始測量值和觀察結果")
     st.markdown("---")
 
+    # Column membership is checked several times below
+    df_cols = set(df.columns)
+
     # ===== Data Summary Section =====
     st.subheader("1️⃣ 數據摘要")
 
+    summary = _summary_stats(df)
+
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
@@ -42,17 +359,17 @@ def render(df: pd.DataFrame):
     with col2:
         st.metric(
             label="監測站數",
-            value=f"{df['sitename'].nunique()}"
+            value=f"{summary['stations']}"
         )
 
     with col3:
         st.metric(
             label="涵蓋縣市",
-            value=f"{df['county'].nunique()}"
+            value=f"{summary['counties']}"
         )
 
     with col4:
-        date_range_days = (df['date'].max() - df['date'].min()).days
+        date_range_days = (summary['date_max'] - summary['date_min']).days
         st.metric(
             label="時間跨度",
             value=f"{date_range_days} 天"
@@ -65,7 +382,7 @@ def render(df: pd.DataFrame):
         )
 
     # Date range info
-    st.info(f"📅 數據時間範圍: {df['date'].min().date()} ~ {df['date'].max().date()}")
+    st.info(f"📅 數據時間範圍: {summary['date_min'].date()} ~ {summary['date_max'].date()}")
 
     # ===== Selection Summary & Consistency Check =====
     st.markdown("---")
@@ -77,11 +394,18 @@ def render(df: pd.DataFrame):
     sel_stations = list(sss.get('selected_stations', []))
     sel_date = sss.get('date_range', None)
 
-    present_counties = sorted(df['county'].dropna().unique().tolist()) if 'county' in df.columns else []
-    present_stations = sorted(df['sitename'].dropna().unique().tolist()) if 'sitename' in df.columns else []
+    # Membership against cached frozensets; only the selections are iterated
+    if sel_counties:
+        county_set = _present_set(df, 'county')
+        missing_counties = sorted({c for c in sel_counties if c not in county_set})
+    else:
+        missing_counties = []
 
-    missing_counties = sorted(set(sel_counties) - set(present_counties)) if sel_counties else []
-    missing_stations = sorted(set(sel_stations) - set(present_stations)) if sel_stations else []
+    if sel_stations:
+        station_set = _present_set(df, 'sitename')
+        missing_stations = sorted({s for s in sel_stations if s not in station_set})
+    else:
+        missing_stations = []
 
     cols = st.columns(3)
     with cols[0]:
@@ -119,14 +443,7 @@ def render(df: pd.DataFrame):
         )
 
     # Apply sorting
-    if sort_by == "最新記錄":
-        df_display = df.sort_values('date', ascending=False).head(num_rows)
-    elif sort_by == "最舊記錄":
-        df_display = df.sort_values('date', ascending=True).head(num_rows)
-    elif sort_by == "AQI最高":
-        df_display = df.sort_values('aqi', ascending=False).head(num_rows)
-    else:  # AQI最低
-        df_display = df.sort_values('aqi', ascending=True).head(num_rows)
+    df_display = _display_rows(df, sort_by, num_rows)
 
     # Select columns to display
     display_columns = [
@@ -136,19 +453,23 @@ def render(df: pd.DataFrame):
     ]
 
     # Filter to existing columns
-    display_columns = [col for col in display_columns if col in df.columns]
+    display_columns = [col for col in display_columns if col in df_cols]
+
+    # Send a compact payload: no source index, float64 narrowed to float32
+    payload = df_display[display_columns].reset_index(drop=True)
+    float64_cols = payload.select_dtypes(include='float64').columns
+    payload[float64_cols] = payload[float64_cols].astype('float32')
 
     st.dataframe(
-        df_display[display_columns],
+        payload,
         width='stretch',
         height=400
     )
 
-    # Download button for filtered data
-    csv = df_display.to_csv(index=False, encoding='utf-8-sig')
+    # Download button for filtered data (serialized once per sort/row choice)
     st.download_button(
         label="📥 下載當前數據為CSV",
-        data=csv,
+        data=_display_csv(df, sort_by, num_rows),
         file_name=f"air_quality_data_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
         mime="text/csv"
     )
@@ -163,29 +484,25 @@ def render(df: pd.DataFrame):
         st.markdown("#### 缺失值統計")
 
         # Calculate missing values
-        missing_stats = pd.DataFrame({
-            '缺失數': df.isnull().sum(),
-            '缺失比例(%)': (df.isnull().sum() / len(df) * 100).round(2)
-        })
-
-        # Filter to columns with missing values
-        missing_stats = missing_stats[missing_stats['缺失數'] > 0]
+        missing_stats = _missing_stats(df)
 
         if len(missing_stats) > 0:
             st.warning(f"⚠️ 共有 {len(missing_stats)} 個欄位包含缺失值")
             st.dataframe(missing_stats.sort_values('缺失比例(%)', ascending=False))
 
             # Visualize missing data
-            import plotly.express as px
-
-            fig = px.bar(
-                missing_stats.reset_index(),
-                x='index',
-                y='缺失比例(%)',
-                title='各欄位缺失比例',
-                labels={'index': '欄位名稱', '缺失比例(%)': '缺失比例 (%)'}
-            )
-            fig.update_layout(height=400)
+            def build_missing_bar():
+                fig = px.bar(
+                    missing_stats.reset_index(),
+                    x='index',
+                    y='缺失比例(%)',
+                    title='各欄位缺失比例',
+                    labels={'index': '欄位名稱', '缺失比例(%)': '缺失比例 (%)'}
+                )
+                fig.update_layout(height=400)
+                return fig
+
+            fig = _memo_figure('missing_bar', df, build_missing_bar)
             st.plotly_chart(fig, width='stretch')
 
         else:
@@ -194,28 +511,18 @@ def render(df: pd.DataFrame):
     with tab2:
         st.markdown("#### 數據類型信息")
 
-        # Get data types
-        dtypes_df = pd.DataFrame({
-            '欄位名稱': df.columns,
-            '數據類型': df.dtypes.values,
-            '非空數量': df.count().values,
-            '唯一值數量': [df[col].nunique() for col in df.columns]
-        })
-        # Ensure Arrow-compatible types for display: cast dtype objects to string
-        dtypes_df['數據類型'] = dtypes_df['數據類型'].astype(str)
+        # Distinct counts scan every column, so they are opt-in
+        show_cardinality = st.checkbox("顯示唯一值數量（較慢）", value=False)
+        dtypes_df = _dtype_table(df, show_cardinality)
 
         st.dataframe(dtypes_df, width='stretch')
 
     with tab3:
         st.markdown("#### 數值欄位基本統計")
 
-        # Get numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-        if numeric_cols:
-            stats_df = df[numeric_cols].describe().T
-            stats_df = stats_df.round(2)
+        stats_df = _numeric_describe(df)
 
+        if not stats_df.empty:
             st.dataframe(stats_df, width='stretch')
         else:
             st.info("無數值型欄位")
@@ -229,33 +536,19 @@ def render(df: pd.DataFrame):
     with col1:
         st.markdown("#### 📍 監測站分布")
 
-        station_count = df.groupby('county')['sitename'].nunique().sort_values(ascending=False)
-
-        import plotly.express as px
-
-        fig = px.bar(
-            x=station_count.values,
-            y=station_count.index,
-            orientation='h',
-            title='各縣市監測站數量',
-            labels={'x': '監測站數', 'y': '縣市'}
+        fig = _memo_figure(
+            'station_bar', df,
+            lambda: _county_bar(_station_counts(df), '各縣市監測站數量', '監測站數')
         )
-        fig.update_layout(height=400, showlegend=False)
         st.plotly_chart(fig, width='stretch')
 
     with col2:
         st.markdown("#### 📈 記錄數分布")
 
-        record_count = df.groupby('county').size().sort_values(ascending=False)
-
-        fig = px.bar(
-            x=record_count.values,
-            y=record_count.index,
-            orientation='h',
-            title='各縣市記錄數量',
-            labels={'x': '記錄數', 'y': '縣市'}
+        fig = _memo_figure(
+            'record_bar', df,
+            lambda: _county_bar(_record_counts(df), '各縣市記錄數量', '記錄數')
         )
-        fig.update_layout(height=400, showlegend=False)
         st.plotly_chart(fig, width='stretch')
 
     # ===== Additional Information =====
@@ -271,10 +564,12 @@ def render(df: pd.DataFrame):
     - **T (時間維度)**: date, year, month, day, hour, dayofweek, quarter, season, yq, ym
     """)
 
-    # Show example of dimension labels (user-controlled sample)
+    # Show example of dimension labels (user-controlled sample). Streamlit
+    # runs an expander's body even while it is collapsed, so the county
+    # filter and station listing wait for the checkbox.
     with st.expander("查看維度標籤示例"):
-        if 'region' in df.columns:
-            present_counties = sorted(df['county'].dropna().unique().tolist())
+        if 'region' in df_cols and st.checkbox("載入範例記錄", key='page1_sample_expand'):
+            present_counties = _present_values(df, 'county')
             # Choose default county: first in intersection with user selection, else first present
             if sel_counties:
                 defaults = [c for c in present_counties if c in sel_counties]
@@ -286,8 +581,8 @@ def render(df: pd.DataFrame):
                 st.info("當前資料無可用縣市。")
             else:
                 chosen_county = st.selectbox("範例縣市", present_counties, index=present_counties.index(default_county))
-                county_df = df[df['county'] == chosen_county]
-                stations_in_county = sorted(county_df['sitename'].dropna().unique().tolist())
+                county_df = df.iloc[np.flatnonzero(_label_mask(df['county'], chosen_county))]
+                stations_in_county = _sorted_labels(county_df['sitename'])
 
                 # Choose default station: intersection with user selection, else first
                 if sel_stations:
@@ -300,11 +595,16 @@ def render(df: pd.DataFrame):
                     st.info("此縣市在當前區間內沒有站點資料。")
                 else:
                     chosen_station = st.selectbox("範例站點", stations_in_county, index=stations_in_county.index(default_station))
-                    sample = county_df[county_df['sitename'] == chosen_station]
+                    sample = county_df.iloc[np.flatnonzero(_label_mask(county_df['sitename'], chosen_station))]
                     if sample.empty:
                         st.warning("無法取得範例記錄。")
                     else:
-                        sample_row = sample.iloc[0]
+                        # Read only the displayed fields as scalars instead of
+                        # materializing the whole first row
+                        sample_row = {
+                            c: sample.iat[0, sample.columns.get_loc(c)]
+                            for c in _SAMPLE_FIELDS if c in df_cols
+                        }
                         st.markdown("#### 範例記錄的維度標籤：")
 
                         col1, col2, col3, col4 = st.columns(4)
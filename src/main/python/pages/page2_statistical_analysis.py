@@ -16,24 +16,327 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import sys
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # Add parent directory for imports
 parent_dir = Path(__file__).parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-from utils.app_utils import 空氣質量結構, get_aqi_color
+from utils.app_utils import get_aqi_color, DATAFRAME_CACHE, memo_figure
+from utils.app_cache import group_mean, pivot_mean, structure_table
+from utils.downsample import lttb
 from utils.app_viz import (
     create_time_series_plot,
-    create_crosstab_heatmap,
+    create_heatmap,
     create_distribution_plot,
     create_bar_chart,
     create_trend_with_moving_average,
     create_scatter_plot
 )
 
+# Measurement columns averaged per day for the trend and bivariate sections
+DAILY_MEAN_COLUMNS = ('aqi', 'windspeed', 'pm2.5', 'pm10', 'o3', 'co', 'so2', 'no2')
+
+# Scatter plots draw at most this many points; statistics use every point
+MAX_SCATTER_POINTS = 2000
+
+# Nanoseconds per calendar day, for integer day keys
+_NS_PER_DAY = 86_400_000_000_000
+
+# Daily trend lines longer than this are drawn from an LTTB sample of
+# TREND_SAMPLE_POINTS points; their statistics use every day
+MAX_TREND_POINTS = 800
+TREND_SAMPLE_POINTS = 500
+
+
+def _most_common_label(labels: pd.Series) -> Optional[Any]:
+    """
+    Find the most frequent value of a label column.
+
+    Categorical labels are counted with a bincount over their integer codes;
+    other dtypes fall back to value_counts.
+
+    Args:
+        labels: Label column (missing values are ignored)
+
+    Returns:
+        The most frequent label, or None when the column has no values
+    """
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        codes = labels.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        if codes.size == 0:
+            return None
+        return labels.cat.categories[np.bincount(codes).argmax()]
+
+    counts = labels.value_counts()
+    return counts.index[0] if len(counts) > 0 else None
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _kpis(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the headline KPI values.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Dictionary of AQI statistics, compliance rate, station count and
+        the most common main pollutant
+    """
+    # AQI statistics from one NumPy buffer; missing values are skipped like
+    # the pandas reductions do, while the compliance rate keeps every record
+    # in its denominator
+    aqi = df['aqi'].to_numpy()
+    valid = aqi[~np.isnan(aqi)]
+    has_aqi = valid.size > 0
+
+    main_pollutant = _most_common_label(df['pollutant'])
+
+    return {
+        'avg_aqi': valid.mean() if has_aqi else float('nan'),
+        'median_aqi': np.median(valid) if has_aqi else float('nan'),
+        'max_aqi': valid.max() if has_aqi else float('nan'),
+        'compliance_rate': np.count_nonzero(valid <= 100) / len(aqi) * 100 if len(aqi) else float('nan'),
+        'main_pollutant': main_pollutant if main_pollutant is not None else "N/A",
+        'stations': df['sitename'].nunique(),
+    }
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _aqi_level_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count records per AQI level with their share.
+
+    Args:
+        df: Air quality DataFrame with the aqi_level label
+
+    Returns:
+        DataFrame with level, record count and percentage, largest first
+    """
+    counts = df['aqi_level'].value_counts()
+    counts = counts[counts > 0]
+    return pd.DataFrame({
+        'AQI等級': counts.index.astype(str),
+        '記錄數': counts.values,
+        '比例(%)': (counts.values * (100.0 / counts.sum())).round(1)
+    })
+
+
+def _day_key(df: pd.DataFrame) -> Any:
+    """
+    Build the calendar-day groupby key as integer day numbers.
+
+    Integer keys factorize faster than timestamps (and much faster than
+    the Python date objects dt.date would box every value into).
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        int32 days since 1970-01-01 per record (a nullable integer array
+        when some dates are missing, so those records drop out of the
+        groupby)
+    """
+    dates = df['date']
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    days = (values.view(np.int64) // _NS_PER_DAY).astype(np.int32)
+
+    missing = np.isnat(values)
+    if missing.any():
+        return pd.arrays.IntegerArray(days, missing)
+    return days
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _daily_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate every per-day series used on the page in one groupby pass.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        DataFrame with a datetime 'date' column, the daily mean of each
+        available measurement column and the day's season label
+    """
+    agg_spec = {col: 'mean' for col in DAILY_MEAN_COLUMNS if col in df.columns}
+    if 'season' in df.columns:
+        agg_spec['season'] = 'first'
+
+    daily = df.groupby(_day_key(df)).agg(agg_spec)
+
+    # Day numbers back to midnight timestamps, once per day rather than per record
+    daily.index = pd.to_datetime(daily.index.to_numpy(dtype=np.int64), unit='D').rename('date')
+    return daily.reset_index()
+
+
+def _plot_sample(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Thin out scatter data before it is sent to the browser.
+
+    Args:
+        data: Points to plot
+
+    Returns:
+        The data itself, or a reproducible random sample of
+        MAX_SCATTER_POINTS rows when it is larger
+    """
+    if len(data) <= MAX_SCATTER_POINTS:
+        return data
+    return data.sample(n=MAX_SCATTER_POINTS, random_state=0)
+
+
+def _trend_sample(daily: pd.DataFrame, value_col: str) -> pd.DataFrame:
+    """
+    Thin out a daily series before it is drawn as a line.
+
+    Args:
+        daily: Daily frame with a date column, in date order
+        value_col: Column plotted against the date
+
+    Returns:
+        The data itself, or an LTTB sample of TREND_SAMPLE_POINTS rows when
+        it has more than MAX_TREND_POINTS days
+    """
+    if len(daily) <= MAX_TREND_POINTS:
+        return daily
+    return lttb(daily, 'date', value_col, TREND_SAMPLE_POINTS)
+
+
+def _linear_fit(x: pd.Series, y: pd.Series) -> Tuple[float, float, float]:
+    """
+    Fit y = a + b*x by least squares and compute the Pearson correlation.
+
+    Both come from the same centred sums, so the arrays are traversed once
+    and no Vandermonde matrix or SVD is built.
+
+    Args:
+        x: Predictor values (no missing values)
+        y: Response values (no missing values)
+
+    Returns:
+        Tuple of (slope, intercept, correlation); slope and intercept are
+        NaN when x is constant and the correlation is NaN when either series
+        is constant
+    """
+    dx = x.to_numpy(dtype=np.float64)
+    dy = y.to_numpy(dtype=np.float64)
+    x_mean, y_mean = dx.mean(), dy.mean()
+    dx = dx - x_mean
+    dy = dy - y_mean
+
+    sxx = np.dot(dx, dx)
+    syy = np.dot(dy, dy)
+    sxy = np.dot(dx, dy)
+
+    slope = sxy / sxx if sxx > 0 else float('nan')
+    corr = sxy / np.sqrt(sxx * syy) if sxx > 0 and syy > 0 else float('nan')
+    return slope, y_mean - slope * x_mean, corr
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _season_correlations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Correlate daily wind speed and PM2.5 within each season.
+
+    All seasons are handled by grouped sums over the centred daily values
+    instead of a per-season filter and pearsonr call.
+
+    Args:
+        df: Air quality DataFrame
+
+    Returns:
+        Display table with sample size, correlation, p-value and means for
+        every season with more than two days of data
+    """
+    from scipy.stats import t as t_dist
+
+    data = _daily_frame(df)[['windspeed', 'pm2.5', 'season']].dropna()
+    grouped = data.groupby('season', observed=True)
+
+    means = grouped[['windspeed', 'pm2.5']].mean()
+    centred = data[['windspeed', 'pm2.5']] - grouped[['windspeed', 'pm2.5']].transform('mean')
+    sums = pd.DataFrame({
+        'sxx': centred['windspeed'] ** 2,
+        'syy': centred['pm2.5'] ** 2,
+        'sxy': centred['windspeed'] * centred['pm2.5'],
+        'season': data['season']
+    }).groupby('season', observed=True).sum()
+
+    n = grouped.size()
+    keep = n > 2
+    n, means, sums = n[keep], means[keep], sums[keep]
+
+    corr = sums['sxy'] / np.sqrt(sums['sxx'] * sums['syy'])
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = corr * np.sqrt(dof / (1 - corr ** 2))
+    pvalue = 2 * t_dist.sf(np.abs(t_stat), dof)
+
+    return pd.DataFrame({
+        '季節': n.index.astype(str),
+        '樣本數': n.values,
+        '相關係數': [f"{v:.3f}" for v in corr],
+        'p-value': [f"{v:.4f}" for v in pvalue],
+        '平均風速': [f"{v:.2f}" for v in means['windspeed']],
+        '平均PM2.5': [f"{v:.2f}" for v in means['pm2.5']]
+    })
+
+
+def _memo_figure(name: str, df: pd.DataFrame, build: Callable[[], go.Figure]) -> go.Figure:
+    """
+    Return a page 2 figure memoized in session_state for the current DataFrame.
+
+    Args:
+        name: Figure name, including the widget values it depends on
+        df: Air quality DataFrame the figure is derived from
+        build: Zero-argument callable that builds the figure
+
+    Returns:
+        Plotly figure
+    """
+    return memo_figure(st.session_state, 'page2_figures', name, df, build)
+
+
+def _aqi_level_pie(aqi_level_table: pd.DataFrame) -> go.Figure:
+    """
+    Build the AQI level share pie chart.
+
+    Args:
+        aqi_level_table: Output of _aqi_level_table
+
+    Returns:
+        Plotly figure
+    """
+    fig = px.pie(
+        values=aqi_level_table['記錄數'],
+        names=aqi_level_table['AQI等級'],
+        title='AQI等級分布'
+    )
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>數量: %{value}<br>比例: %{percent}<extra></extra>'
+    )
+    fig.update_layout(
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=14,
+            font_family="Arial, Microsoft YaHei, sans-serif",
+            font_color="black"
+        )
+    )
+    return fig
+
 
 def render(df: pd.DataFrame):
     """
@@ -47,15 +350,19 @@ def render(df: pd.DataFrame):
     st.markdown("**問題：有多少？** - 經過處理、彙總、有意義的數據")
     st.markdown("---")
 
+    # Column membership is checked throughout the page
+    df_cols = set(df.columns)
+
     # ===== KPI Metrics Section =====
     st.subheader("1️⃣ 關鍵指標 (KPI)")
 
     # Calculate KPIs
-    avg_aqi = df['aqi'].mean()
-    median_aqi = df['aqi'].median()
-    max_aqi = df['aqi'].max()
-    compliance_rate = (df['aqi'] <= 100).sum() / len(df) * 100
-    main_pollutant = df['pollutant'].mode()[0] if len(df) > 0 else "N/A"
+    kpis = _kpis(df)
+    avg_aqi = kpis['avg_aqi']
+    median_aqi = kpis['median_aqi']
+    max_aqi = kpis['max_aqi']
+    compliance_rate = kpis['compliance_rate']
+    main_pollutant = kpis['main_pollutant']
 
     # Display KPI metrics
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -85,7 +392,7 @@ def render(df: pd.DataFrame):
         )
 
     with col4:
-        unique_stations = df['sitename'].nunique()
+        unique_stations = kpis['stations']
         st.metric(
             label="監測站數",
             value=f"{unique_stations}",
@@ -101,43 +408,17 @@ def render(df: pd.DataFrame):
 
     # AQI level distribution
     st.markdown("#### AQI等級分布")
-    if 'aqi_level' in df.columns:
-        aqi_level_counts = df['aqi_level'].value_counts()
+    if 'aqi_level' in df_cols:
+        aqi_level_table = _aqi_level_table(df)
 
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            import plotly.express as px
-
-            fig = px.pie(
-                values=aqi_level_counts.values,
-                names=aqi_level_counts.index,
-                title='AQI等級分布'
-            )
-            fig.update_traces(
-                textposition='inside',
-                textinfo='percent+label',
-                hovertemplate='<b>%{label}</b><br>數量: %{value}<br>比例: %{percent}<extra></extra>'
-            )
-            fig.update_layout(
-                hoverlabel=dict(
-                    bgcolor="white",
-                    font_size=14,
-                    font_family="Arial, Microsoft YaHei, sans-serif",
-                    font_color="black"
-                )
-            )
+            fig = _memo_figure('aqi_level_pie', df, lambda: _aqi_level_pie(aqi_level_table))
             st.plotly_chart(fig, width='stretch')
 
         with col2:
-            st.dataframe(
-                pd.DataFrame({
-                    'AQI等級': aqi_level_counts.index,
-                    '記錄數': aqi_level_counts.values,
-                    '比例(%)': (aqi_level_counts.values / len(df) * 100).round(1)
-                }),
-                width='stretch'
-            )
+            st.dataframe(aqi_level_table, width='stretch')
 
     # ===== Bivariate Analysis =====
     st.markdown("---")
@@ -146,30 +427,22 @@ def render(df: pd.DataFrame):
 
     tab1, tab2, tab3 = st.tabs(["PM2.5 vs 風速", "按季節分組", "其他污染物對比"])
 
+    # One daily aggregate shared by the bivariate and time series tabs
+    daily_all = _daily_frame(df)
+
     with tab1:
         st.markdown("#### PM2.5 與風速的關係分析")
         st.info("💡 每個散點代表一天的平均數據，不顯示具體日期，專注於數值關係")
 
         # Aggregate by date (daily average)
-        if 'windspeed' in df.columns and 'pm2.5' in df.columns:
-            daily_data = df.groupby(df['date'].dt.date).agg({
-                'windspeed': 'mean',
-                'pm2.5': 'mean'
-            }).reset_index()
-            daily_data.columns = ['date', 'windspeed', 'pm2.5']
-
+        if 'windspeed' in df_cols and 'pm2.5' in df_cols:
             # Remove rows with missing values
-            scatter_data = daily_data[['windspeed', 'pm2.5']].dropna()
+            scatter_data = daily_all[['windspeed', 'pm2.5']].dropna()
 
             if len(scatter_data) > 0:
-                # Calculate correlation
-                from scipy.stats import pearsonr
-                corr, pvalue = pearsonr(scatter_data['windspeed'], scatter_data['pm2.5'])
-
-                # Calculate linear regression slope
-                import numpy as np
-                z = np.polyfit(scatter_data['windspeed'], scatter_data['pm2.5'], 1)
-                slope = z[0]  # PM2.5 change per 1 m/s windspeed increase
+                # Linear regression slope (PM2.5 change per 1 m/s windspeed
+                # increase) and correlation
+                slope, intercept, corr = _linear_fit(scatter_data['windspeed'], scatter_data['pm2.5'])
 
                 # Display statistics
                 st.metric(
@@ -181,11 +454,12 @@ def render(df: pd.DataFrame):
 
                 # Create scatter plot
                 fig = create_scatter_plot(
-                    df=scatter_data,
+                    df=_plot_sample(scatter_data),
                     x_col='windspeed',
                     y_col='pm2.5',
                     title='PM2.5 與風速的關係（每日平均數據）',
-                    show_trendline=True
+                    show_trendline=True,
+                    trendline=(slope, intercept)
                 )
                 st.plotly_chart(fig, use_container_width=True)
 
@@ -218,21 +492,14 @@ def render(df: pd.DataFrame):
         st.markdown("#### 按季節分組的關係分析")
         st.info("💡 觀察不同季節中 PM2.5 與風速的關係是否有差異")
 
-        if 'windspeed' in df.columns and 'pm2.5' in df.columns and 'season' in df.columns:
+        if 'windspeed' in df_cols and 'pm2.5' in df_cols and 'season' in df_cols:
             # Aggregate by date with season
-            daily_data_season = df.groupby(df['date'].dt.date).agg({
-                'windspeed': 'mean',
-                'pm2.5': 'mean',
-                'season': 'first'
-            }).reset_index()
-            daily_data_season.columns = ['date', 'windspeed', 'pm2.5', 'season']
-
-            scatter_data_season = daily_data_season[['windspeed', 'pm2.5', 'season']].dropna()
+            scatter_data_season = daily_all[['windspeed', 'pm2.5', 'season']].dropna()
 
             if len(scatter_data_season) > 0:
                 # Create scatter plot with season coloring
                 fig = create_scatter_plot(
-                    df=scatter_data_season,
+                    df=_plot_sample(scatter_data_season),
                     x_col='windspeed',
                     y_col='pm2.5',
                     title='PM2.5 與風速的關係（按季節著色）',
@@ -244,23 +511,9 @@ def render(df: pd.DataFrame):
                 # Calculate correlation by season
                 st.markdown("#### 各季節相關性分析")
 
-                season_stats = []
-                for season in scatter_data_season['season'].unique():
-                    season_df = scatter_data_season[scatter_data_season['season'] == season]
-                    if len(season_df) > 2:
-                        from scipy.stats import pearsonr
-                        corr_s, pval_s = pearsonr(season_df['windspeed'], season_df['pm2.5'])
-                        season_stats.append({
-                            '季節': season,
-                            '樣本數': len(season_df),
-                            '相關係數': f"{corr_s:.3f}",
-                            'p-value': f"{pval_s:.4f}",
-                            '平均風速': f"{season_df['windspeed'].mean():.2f}",
-                            '平均PM2.5': f"{season_df['pm2.5'].mean():.2f}"
-                        })
-
-                if season_stats:
-                    season_stats_df = pd.DataFrame(season_stats)
+                season_stats_df = _season_correlations(df)
+
+                if not season_stats_df.empty:
                     st.dataframe(season_stats_df, use_container_width=True)
             else:
                 st.warning("⚠️ 數據不足，無法進行季節分析")
@@ -272,7 +525,7 @@ def render(df: pd.DataFrame):
 
         pollutant_options = []
         for col in ['pm2.5', 'pm10', 'o3', 'co', 'so2', 'no2']:
-            if col in df.columns:
+            if col in df_cols:
                 pollutant_options.append(col)
 
         if len(pollutant_options) >= 2:
@@ -289,33 +542,22 @@ def render(df: pd.DataFrame):
                 )
 
             # Aggregate by date
-            daily_custom = df.groupby(df['date'].dt.date).agg({
-                x_var: 'mean',
-                y_var: 'mean'
-            }).reset_index()
-            daily_custom.columns = ['date', x_var, y_var]
-
-            scatter_custom = daily_custom[[x_var, y_var]].dropna()
+            scatter_custom = daily_all[[x_var, y_var]].dropna()
 
             if len(scatter_custom) > 0:
-                # Calculate correlation
-                from scipy.stats import pearsonr
-                corr_c, pvalue_c = pearsonr(scatter_custom[x_var], scatter_custom[y_var])
-
-                # Calculate slope
-                import numpy as np
-                z_c = np.polyfit(scatter_custom[x_var], scatter_custom[y_var], 1)
-                slope_c = z_c[0]
+                # Calculate slope and correlation
+                slope_c, intercept_c, corr_c = _linear_fit(scatter_custom[x_var], scatter_custom[y_var])
 
                 st.metric("回歸斜率", f"{slope_c:.2f}")
 
                 # Create scatter plot
                 fig = create_scatter_plot(
-                    df=scatter_custom,
+                    df=_plot_sample(scatter_custom),
                     x_col=x_var,
                     y_col=y_var,
                     title=f'{y_var.upper()} vs {x_var.upper()}',
-                    show_trendline=True
+                    show_trendline=True,
+                    trendline=(slope_c, intercept_c)
                 )
                 st.plotly_chart(fig, use_container_width=True)
             else:
@@ -333,11 +575,12 @@ def render(df: pd.DataFrame):
         st.markdown("#### AQI時間序列")
 
         # Aggregate by date
-        daily_aqi = df.groupby(df['date'].dt.date)['aqi'].mean().reset_index()
-        daily_aqi.columns = ['date', 'aqi']
-        daily_aqi['date'] = pd.to_datetime(daily_aqi['date'])
+        daily_aqi = daily_all[['date', 'aqi']]
 
-        fig = create_time_series_plot(daily_aqi, 'aqi', 'AQI日平均趨勢')
+        fig = _memo_figure(
+            'aqi_trend', df,
+            lambda: create_time_series_plot(_trend_sample(daily_aqi, 'aqi'), 'aqi', 'AQI日平均趨勢')
+        )
         st.plotly_chart(fig, width='stretch')
 
         # Statistics
@@ -347,7 +590,7 @@ def render(df: pd.DataFrame):
         with col2:
             st.metric("標準差", f"{daily_aqi['aqi'].std():.1f}")
         with col3:
-            trend = "上升" if daily_aqi['aqi'].iloc[-1] > daily_aqi['aqi'].iloc[0] else "下降"
+            trend = "上升" if daily_aqi['aqi'].iat[-1] > daily_aqi['aqi'].iat[0] else "下降"
             st.metric("趨勢", trend)
 
     with tab2:
@@ -359,16 +602,17 @@ def render(df: pd.DataFrame):
             key='pollutant_ts'
         )
 
-        if pollutant_col in df.columns:
-            daily_pollutant = df.groupby(df['date'].dt.date)[pollutant_col].mean().reset_index()
-            daily_pollutant.columns = ['date', pollutant_col]
-            daily_pollutant['date'] = pd.to_datetime(daily_pollutant['date'])
+        if pollutant_col in df_cols:
+            daily_pollutant = daily_all[['date', pollutant_col]]
 
-            fig = create_time_series_plot(
-                daily_pollutant,
-                pollutant_col,
-                f'{pollutant_col.upper()} 日平均趨勢',
-                show_thresholds=False
+            fig = _memo_figure(
+                f'trend_{pollutant_col}', df,
+                lambda: create_time_series_plot(
+                    _trend_sample(daily_pollutant, pollutant_col),
+                    pollutant_col,
+                    f'{pollutant_col.upper()} 日平均趨勢',
+                    show_thresholds=False
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
@@ -377,15 +621,16 @@ def render(df: pd.DataFrame):
 
         window_size = st.slider("移動平均窗口（天）", 3, 30, 7)
 
-        daily_aqi_ma = df.groupby(df['date'].dt.date)['aqi'].mean().reset_index()
-        daily_aqi_ma.columns = ['date', 'aqi']
-        daily_aqi_ma['date'] = pd.to_datetime(daily_aqi_ma['date'])
+        daily_aqi_ma = daily_all[['date', 'aqi']]
 
-        fig = create_trend_with_moving_average(
-            daily_aqi_ma,
-            'aqi',
-            window=window_size,
-            title=f'AQI趨勢分析（{window_size}日移動平均）'
+        fig = _memo_figure(
+            f'moving_average_{window_size}', df,
+            lambda: create_trend_with_moving_average(
+                daily_aqi_ma,
+                'aqi',
+                window=window_size,
+                title=f'AQI趨勢分析（{window_size}日移動平均）'
+            )
         )
         st.plotly_chart(fig, width='stretch')
 
@@ -398,23 +643,20 @@ def render(df: pd.DataFrame):
     with tab1:
         st.markdown("#### 各縣市各月份平均AQI")
 
-        if 'month' in df.columns:
+        if 'month' in df_cols:
             # Create pivot table
-            pivot_data = df.pivot_table(
-                index='county',
-                columns='month',
-                values='aqi',
-                aggfunc='mean'
-            )
-
-            # Display heatmap
-            fig = create_crosstab_heatmap(
-                df,
-                'month',
-                'county',
-                'aqi',
-                'mean',
-                '各縣市各月份平均AQI熱力圖'
+            pivot_data = pivot_mean(df, 'county', 'month')
+
+            # Display heatmap from the same matrix
+            fig = _memo_figure(
+                'county_month_heatmap', df,
+                lambda: create_heatmap(
+                    pivot_data,
+                    'month',
+                    'county',
+                    'aqi',
+                    '各縣市各月份平均AQI熱力圖'
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
@@ -425,19 +667,21 @@ def render(df: pd.DataFrame):
     with tab2:
         st.markdown("#### 各區域各季節平均AQI")
 
-        if 'region' in df.columns and 'season' in df.columns:
-            fig = create_crosstab_heatmap(
-                df,
-                'season',
-                'region',
-                'aqi',
-                'mean',
-                '各區域各季節平均AQI熱力圖'
+        if 'region' in df_cols and 'season' in df_cols:
+            fig = _memo_figure(
+                'region_season_heatmap', df,
+                lambda: create_heatmap(
+                    pivot_mean(df, 'region', 'season'),
+                    'season',
+                    'region',
+                    'aqi',
+                    '各區域各季節平均AQI熱力圖'
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
             # Display statistics
-            regional_stats = 空氣質量結構(df, 'region')
+            regional_stats = structure_table(df, 'region')
             st.dataframe(regional_stats, width='stretch')
 
     # ===== Distribution Analysis =====
@@ -449,20 +693,26 @@ def render(df: pd.DataFrame):
     with col1:
         st.markdown("#### AQI分布直方圖")
 
-        fig = create_distribution_plot(df, 'aqi', 'histogram', 'AQI分布')
+        fig = _memo_figure(
+            'aqi_histogram', df,
+            lambda: create_distribution_plot(df, 'aqi', 'histogram', 'AQI分布')
+        )
         st.plotly_chart(fig, width='stretch')
 
     with col2:
         st.markdown("#### AQI箱型圖")
 
-        fig = create_distribution_plot(df, 'aqi', 'box', 'AQI箱型圖')
+        fig = _memo_figure(
+            'aqi_box', df,
+            lambda: create_distribution_plot(df, 'aqi', 'box', 'AQI箱型圖')
+        )
         st.plotly_chart(fig, width='stretch')
 
     # Pollutant distributions
     st.markdown("#### 污染物濃度分布")
 
     pollutant_cols = ['pm2.5', 'pm10', 'o3']
-    pollutant_cols = [col for col in pollutant_cols if col in df.columns]
+    pollutant_cols = [col for col in pollutant_cols if col in df_cols]
 
     if pollutant_cols:
         selected_pollutant = st.selectbox(
@@ -474,20 +724,26 @@ def render(df: pd.DataFrame):
         col1, col2 = st.columns(2)
 
         with col1:
-            fig = create_distribution_plot(
-                df,
-                selected_pollutant,
-                'histogram',
-                f'{selected_pollutant.upper()} 分布'
+            fig = _memo_figure(
+                f'histogram_{selected_pollutant}', df,
+                lambda: create_distribution_plot(
+                    df,
+                    selected_pollutant,
+                    'histogram',
+                    f'{selected_pollutant.upper()} 分布'
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
         with col2:
-            fig = create_distribution_plot(
-                df,
-                selected_pollutant,
-                'box',
-                f'{selected_pollutant.upper()} 箱型圖'
+            fig = _memo_figure(
+                f'box_{selected_pollutant}', df,
+                lambda: create_distribution_plot(
+                    df,
+                    selected_pollutant,
+                    'box',
+                    f'{selected_pollutant.upper()} 箱型圖'
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
@@ -495,48 +751,54 @@ def render(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("6️⃣ 空氣質量結構分析")
 
+    # The county ranking also feeds the summary at the end of the page
+    county_structure = structure_table(df, 'county', sort_by='平均AQI', ascending=False)
+
     tab1, tab2, tab3 = st.tabs(["按縣市", "按季節", "按年度"])
 
     with tab1:
         st.markdown("#### 各縣市空氣質量結構")
 
-        county_structure = 空氣質量結構(df, 'county')
-        county_structure = county_structure.sort_values('平均AQI', ascending=False)
-
         st.dataframe(county_structure, width='stretch')
 
         # Visualize
-        fig = create_bar_chart(
-            county_structure.head(15),
-            'county',
-            '平均AQI',
-            orientation='h',
-            title='各縣市平均AQI (前15名)'
+        fig = _memo_figure(
+            'county_bar', df,
+            lambda: create_bar_chart(
+                county_structure.head(15),
+                'county',
+                '平均AQI',
+                orientation='h',
+                title='各縣市平均AQI (前15名)'
+            )
         )
         st.plotly_chart(fig, width='stretch')
 
     with tab2:
-        if 'season' in df.columns:
+        if 'season' in df_cols:
             st.markdown("#### 各季節空氣質量結構")
 
-            season_structure = 空氣質量結構(df, 'season')
+            season_structure = structure_table(df, 'season')
 
             st.dataframe(season_structure, width='stretch')
 
-            fig = create_bar_chart(
-                season_structure,
-                'season',
-                '平均AQI',
-                title='各季節平均AQI'
+            fig = _memo_figure(
+                'season_bar', df,
+                lambda: create_bar_chart(
+                    season_structure,
+                    'season',
+                    '平均AQI',
+                    title='各季節平均AQI'
+                )
             )
             st.plotly_chart(fig, width='stretch')
 
     with tab3:
-        if 'year' in df.columns:
+        if 'year' in df_cols:
             st.markdown("#### 各年度空氣質量結構")
 
-            year_structure = 空氣質量結構(df, 'year')
-            year_structure = year_structure.sort_values('year')
+            # Groupby output is already in year order
+            year_structure = structure_table(df, 'year')
 
             st.dataframe(year_structure, width='stretch')
 
@@ -563,7 +825,7 @@ def render(df: pd.DataFrame):
                 st.plotly_chart(fig, width='stretch')
             else:
                 st.info('目前篩選僅含單一年度，改顯示該年度的月趨勢')
-                monthly = df.groupby('month')['aqi'].mean().reset_index()
+                monthly = group_mean(df, 'month').reset_index()
                 fig = px.line(
                     monthly,
                     x='month',
@@ -589,10 +851,10 @@ def render(df: pd.DataFrame):
     st.markdown("---")
 
     # Calculate key insights
-    best_county = county_structure.iloc[-1]['county']
-    worst_county = county_structure.iloc[0]['county']
-    best_aqi = county_structure.iloc[-1]['平均AQI']
-    worst_aqi = county_structure.iloc[0]['平均AQI']
+    best_county = county_structure['county'].iat[-1]
+    worst_county = county_structure['county'].iat[0]
+    best_aqi = county_structure['平均AQI'].iat[-1]
+    worst_aqi = county_structure['平均AQI'].iat[0]
 
     st.success(f"""
     ### 📊 統計分析摘要
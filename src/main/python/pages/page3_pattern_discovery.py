@@ -17,6 +17,7 @@ import pandas as pd
 import numpy as np
 import sys
 from pathlib import Path
+from typing import Callable, Tuple
 
 # Add parent directory for imports
 parent_dir = Path(__file__).parent.parent
@@ -25,14 +26,117 @@ if str(parent_dir) not in sys.path:
 
 from utils.app_viz import (
     create_seasonal_pattern_plot,
-    create_correlation_matrix,
+    create_correlation_heatmap,
     create_comparison_plot,
     create_wind_rose,
     create_map_plot
 )
+from utils.app_cache import group_mean, group_agg, structure_table, correlation_matrix
+from utils.app_utils import DATAFRAME_CACHE, memo_figure
 import plotly.express as px
 import plotly.graph_objects as go
 
+# Wind direction sectors: bin edges in degrees and the sector of each bin,
+# with the last bin (>= 315) wrapping back to north
+WIND_DIRECTION_EDGES = np.array([45, 135, 225, 315])
+WIND_DIRECTION_LABELS = ['北風', '東風', '南風', '西風']
+_WIND_DIRECTION_CODES = np.array([0, 1, 2, 3, 0], dtype=np.int8)
+
+
+def _wind_direction_labels(winddirec: pd.Series) -> pd.Series:
+    """
+    Classify wind directions in degrees into four compass sectors.
+
+    Args:
+        winddirec: Wind direction in degrees (0-360, may contain NaN)
+
+    Returns:
+        Categorical Series of sector labels aligned with the input;
+        missing directions stay missing
+    """
+    degrees = winddirec.to_numpy(dtype=np.float64)
+    codes = _WIND_DIRECTION_CODES[np.searchsorted(WIND_DIRECTION_EDGES, degrees, side='right')]
+    codes = np.where(np.isnan(degrees), -1, codes)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=WIND_DIRECTION_LABELS),
+        index=winddirec.index,
+        name='wind_dir'
+    )
+
+
+def _wind_speed_effect(windspeed: pd.Series, aqi: pd.Series) -> Tuple[float, float, float]:
+    """
+    Relate AQI to wind speed in one pass over both arrays.
+
+    Records are bucketed as calm (< 2 m/s), moderate or strong (> 5 m/s)
+    and the bucket means come from a weighted bincount.
+
+    Args:
+        windspeed: Wind speed in m/s
+        aqi: AQI values aligned with windspeed
+
+    Returns:
+        Tuple of (correlation, mean AQI below 2 m/s, mean AQI above 5 m/s);
+        a bucket without records has mean 0
+    """
+    ws = windspeed.to_numpy(dtype=np.float64)
+    values = aqi.to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(ws) | np.isnan(values))
+    ws, values = ws[valid], values[valid]
+
+    buckets = (ws >= 2).astype(np.intp) + (ws > 5)
+    sums = np.bincount(buckets, weights=values, minlength=3)
+    counts = np.bincount(buckets, minlength=3)
+    means = np.divide(sums, counts, out=np.zeros(3), where=counts > 0)
+
+    correlation = np.corrcoef(ws, values)[0, 1] if len(ws) > 1 else float('nan')
+    return correlation, means[0], means[2]
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _wind_speed_summary(df: pd.DataFrame) -> Tuple[float, float, float]:
+    """
+    Cached wind speed effect of the loaded frame (see _wind_speed_effect).
+
+    Args:
+        df: Air quality DataFrame with windspeed and aqi columns
+
+    Returns:
+        Tuple of (correlation, mean AQI below 2 m/s, mean AQI above 5 m/s)
+    """
+    return _wind_speed_effect(df['windspeed'], df['aqi'])
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def _wind_direction_aqi(df: pd.DataFrame) -> pd.Series:
+    """
+    Mean AQI per wind direction sector.
+
+    Args:
+        df: Air quality DataFrame with winddirec and aqi columns
+
+    Returns:
+        Series of mean AQI indexed by sector, highest first
+    """
+    wind_dir = _wind_direction_labels(df['winddirec'])
+    return df.groupby(wind_dir, observed=True, sort=False)['aqi'].mean().sort_values(ascending=False)
+
+
+def _memo_figure(name: str, df: pd.DataFrame, build: Callable[[], go.Figure]) -> go.Figure:
+    """
+    Return a page 3 figure memoized in session_state for the current DataFrame.
+
+    Args:
+        name: Figure name within the page
+        df: Air quality DataFrame the figure is derived from
+        build: Zero-argument callable that builds the figure
+
+    Returns:
+        Plotly figure
+    """
+    return memo_figure(st.session_state, 'page3_figures', name, df, build)
+
 
 def render(df: pd.DataFrame):
     """
@@ -46,10 +150,13 @@ def render(df: pd.DataFrame):
     st.markdown("**問題：為什麼？** - 理解數據中的模式、規律和因果關係")
     st.markdown("---")
 
+    # Column membership is checked throughout the page
+    df_cols = set(df.columns)
+
     # ===== Seasonal Patterns =====
     st.subheader("1️⃣ 季節性污染模式")
 
-    if 'season' in df.columns:
+    if 'season' in df_cols:
         col1, col2 = st.columns([2, 1])
 
         with col1:
@@ -61,14 +168,15 @@ def render(df: pd.DataFrame):
         with col2:
             st.markdown("#### 季節統計")
 
-            seasonal_stats = df.groupby('season')['aqi'].agg(['mean', 'std', 'max', 'min']).round(1)
+            seasonal_stats = group_agg(df, 'season', 'aqi', ('mean', 'std', 'max', 'min')).round(1)
             seasonal_stats.columns = ['平均值', '標準差', '最大值', '最小值']
 
             st.dataframe(seasonal_stats, width='stretch')
 
         # Seasonal insights
-        winter_aqi = df[df['season'] == '冬季']['aqi'].mean()
-        summer_aqi = df[df['season'] == '夏季']['aqi'].mean()
+        season_means = group_mean(df, 'season')
+        winter_aqi = season_means.get('冬季', np.nan)
+        summer_aqi = season_means.get('夏季', np.nan)
         diff_pct = ((winter_aqi - summer_aqi) / summer_aqi * 100) if summer_aqi > 0 else 0
 
         st.info(f"""
@@ -79,7 +187,7 @@ def render(df: pd.DataFrame):
         """)
 
         # PM2.5 seasonal pattern
-        if 'pm2.5' in df.columns:
+        if 'pm2.5' in df_cols:
             st.markdown("#### PM2.5季節模式")
 
             fig = create_seasonal_pattern_plot(df, 'pm2.5', '各季節PM2.5濃度')
@@ -92,7 +200,7 @@ def render(df: pd.DataFrame):
     tab1, tab2, tab3 = st.tabs(["區域比較", "地理地圖", "城鄉差異"])
 
     with tab1:
-        if 'region' in df.columns:
+        if 'region' in df_cols:
             st.markdown("#### 各區域空氣質量比較")
 
             fig = create_comparison_plot(
@@ -104,25 +212,24 @@ def render(df: pd.DataFrame):
             st.plotly_chart(fig, width='stretch')
 
             # Regional statistics
-            regional_stats = df.groupby('region').agg({
-                'aqi': ['mean', 'median', 'max'],
-                'pm2.5': 'mean',
-                'sitename': 'nunique'
-            }).round(1)
-
-            regional_stats.columns = ['平均AQI', 'AQI中位數', '最高AQI', '平均PM2.5', '監測站數']
-            st.dataframe(regional_stats.sort_values('平均AQI', ascending=False), width='stretch')
+            regional_stats = structure_table(df, 'region', sort_by='平均AQI', ascending=False)
+            regional_stats = regional_stats.set_index('region')[
+                ['平均AQI', 'AQI中位數', '最高AQI', '平均PM2.5', '監測站數']
+            ].round(1)
+            st.dataframe(regional_stats, width='stretch')
 
             # Geographic insights
             west_regions = ['北部', '中部', '南部']
             east_regions = ['東部']
 
-            west_df = df[df['region'].isin(west_regions)]
-            east_df = df[df['region'].isin(east_regions)]
+            # Pooled means from per-region sums and counts of the same pass
+            region_pm25 = group_agg(df, 'region', 'pm2.5', ('sum', 'count'))
+            west = region_pm25.reindex(west_regions).sum()
+            east = region_pm25.reindex(east_regions).sum()
 
-            if len(west_df) > 0 and len(east_df) > 0:
-                west_aqi = west_df['pm2.5'].mean()
-                east_aqi = east_df['pm2.5'].mean()
+            if west['count'] > 0 and east['count'] > 0:
+                west_aqi = west['sum'] / west['count']
+                east_aqi = east['sum'] / east['count']
                 diff_pct = ((west_aqi - east_aqi) / east_aqi * 100) if east_aqi > 0 else 0
 
                 st.info(f"""
@@ -133,11 +240,14 @@ def render(df: pd.DataFrame):
                 """)
 
     with tab2:
-        if 'latitude' in df.columns and 'longitude' in df.columns:
+        if 'latitude' in df_cols and 'longitude' in df_cols:
             st.markdown("#### 監測站空氣質量地理分布")
 
             try:
-                fig = create_map_plot(df, 'pm2.5', 'aqi', '監測站平均AQI地理分布')
+                fig = _memo_figure(
+                    'station_map', df,
+                    lambda: create_map_plot(df, 'pm2.5', 'aqi', '監測站平均AQI地理分布')
+                )
                 st.plotly_chart(fig, width='stretch')
             except Exception as e:
                 st.warning(f"地圖顯示錯誤: {e}")
@@ -147,7 +257,7 @@ def render(df: pd.DataFrame):
 
         top_n = st.slider("顯示前N個縣市", 5, 20, 10, key='county_top_n')
 
-        county_stats = df.groupby('county')['aqi'].mean().sort_values(ascending=False).head(top_n)
+        county_stats = group_mean(df, 'county').sort_values(ascending=False).head(top_n)
 
         fig = px.bar(
             x=county_stats.values,
@@ -168,11 +278,11 @@ def render(df: pd.DataFrame):
     tab1, tab2 = st.tabs(["風速影響", "風向分析"])
 
     with tab1:
-        if 'wind_level' in df.columns:
+        if 'wind_level' in df_cols:
             st.markdown("#### 風速對空氣質量的影響")
 
             # Wind speed vs AQI
-            wind_aqi = df.groupby('wind_level')['aqi'].agg(['mean', 'count']).reset_index()
+            wind_aqi = group_agg(df, 'wind_level', 'aqi', ('mean', 'count')).reset_index()
             wind_aqi.columns = ['風速等級', '平均AQI', '記錄數']
 
             col1, col2 = st.columns([2, 1])
@@ -204,11 +314,8 @@ def render(df: pd.DataFrame):
                 st.dataframe(wind_aqi, width='stretch')
 
             # Calculate correlation
-            if 'windspeed' in df.columns:
-                correlation = df[['windspeed', 'aqi']].corr().iloc[0, 1]
-
-                low_wind_aqi = df[df['windspeed'] < 2]['aqi'].mean() if len(df[df['windspeed'] < 2]) > 0 else 0
-                high_wind_aqi = df[df['windspeed'] > 5]['aqi'].mean() if len(df[df['windspeed'] > 5]) > 0 else 0
+            if 'windspeed' in df_cols:
+                correlation, low_wind_aqi, high_wind_aqi = _wind_speed_summary(df)
 
                 reduction_pct = ((low_wind_aqi - high_wind_aqi) / low_wind_aqi * 100) if low_wind_aqi > 0 else 0
 
@@ -224,14 +331,14 @@ def render(df: pd.DataFrame):
                 """)
 
     with tab2:
-        if 'winddirec' in df.columns:
+        if 'winddirec' in df_cols:
             st.markdown("#### 風向分布與污染")
 
             col1, col2 = st.columns(2)
 
             with col1:
                 try:
-                    fig = create_wind_rose(df, '風向分布圖')
+                    fig = _memo_figure('wind_rose', df, lambda: create_wind_rose(df, '風向分布圖'))
                     st.plotly_chart(fig, width='stretch')
                 except Exception as e:
                     st.warning(f"風向圖顯示錯誤: {e}")
@@ -239,22 +346,7 @@ def render(df: pd.DataFrame):
             with col2:
                 st.markdown("##### 不同風向的平均AQI")
 
-                # Categorize wind direction
-                def direction_category(degree):
-                    if pd.isna(degree):
-                        return None
-                    if degree < 45 or degree >= 315:
-                        return '北風'
-                    elif degree < 135:
-                        return '東風'
-                    elif degree < 225:
-                        return '南風'
-                    else:
-                        return '西風'
-
-                df_wind = df.copy()
-                df_wind['wind_dir'] = df_wind['winddirec'].apply(direction_category)
-                wind_dir_aqi = df_wind.groupby('wind_dir')['aqi'].mean().sort_values(ascending=False)
+                wind_dir_aqi = _wind_direction_aqi(df)
 
                 if len(wind_dir_aqi) > 0:
                     fig = px.bar(
@@ -281,38 +373,32 @@ def render(df: pd.DataFrame):
     st.subheader("4️⃣ 污染物相關性分析")
 
     pollutant_cols = ['aqi', 'pm2.5', 'pm10', 'o3', 'co', 'so2', 'no2']
-    available_pollutants = [col for col in pollutant_cols if col in df.columns]
+    available_pollutants = [col for col in pollutant_cols if col in df_cols]
 
     if len(available_pollutants) >= 2:
         st.markdown("#### 污染物相關性矩陣")
 
-        fig = create_correlation_matrix(
-            df,
-            available_pollutants,
-            '污染物相關性熱力圖'
-        )
-        st.plotly_chart(fig, width='stretch')
+        # One cached matrix feeds both the heatmap and the insights
+        corr_matrix = correlation_matrix(df, tuple(available_pollutants))
 
-        # Calculate and display correlation insights
-        corr_matrix = df[available_pollutants].corr()
+        fig = create_correlation_heatmap(corr_matrix, '污染物相關性熱力圖')
+        st.plotly_chart(fig, width='stretch')
 
         st.markdown("#### 強相關污染物對")
 
-        # Find strong correlations (> 0.7 or < -0.3)
-        strong_corrs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_val = corr_matrix.iloc[i, j]
-                if abs(corr_val) > 0.7:
-                    strong_corrs.append({
-                        '污染物1': corr_matrix.columns[i],
-                        '污染物2': corr_matrix.columns[j],
-                        '相關係數': round(corr_val, 3),
-                        '關係': '正相關' if corr_val > 0 else '負相關'
-                    })
-
-        if strong_corrs:
-            st.dataframe(pd.DataFrame(strong_corrs), width='stretch')
+        # Find strong correlations (|r| > 0.7) in the upper triangle
+        corr_values = corr_matrix.to_numpy()
+        rows, cols = np.nonzero(np.triu(np.abs(corr_values) > 0.7, k=1))
+        strong_values = corr_values[rows, cols]
+
+        if len(strong_values) > 0:
+            strong_corrs = pd.DataFrame({
+                '污染物1': corr_matrix.columns[rows],
+                '污染物2': corr_matrix.columns[cols],
+                '相關係數': strong_values.round(3),
+                '關係': np.where(strong_values > 0, '正相關', '負相關')
+            })
+            st.dataframe(strong_corrs, width='stretch')
 
             st.info("""
             ### 🔍 觀察
@@ -328,10 +414,10 @@ def render(df: pd.DataFrame):
     tab1, tab2 = st.tabs(["一日模式", "週末效應"])
 
     with tab1:
-        if 'hour' in df.columns:
+        if 'hour' in df_cols:
             st.markdown("#### 一日內AQI變化模式")
 
-            hourly_pattern = df.groupby('hour')['aqi'].mean().reset_index()
+            hourly_pattern = group_mean(df, 'hour').reset_index()
 
             fig = px.line(
                 hourly_pattern,
@@ -357,10 +443,10 @@ def render(df: pd.DataFrame):
             """)
 
     with tab2:
-        if 'is_weekend' in df.columns:
+        if 'is_weekend' in df_cols:
             st.markdown("#### 平日與週末比較")
 
-            weekend_comparison = df.groupby('is_weekend')['aqi'].agg(['mean', 'median', 'std']).round(1)
+            weekend_comparison = group_agg(df, 'is_weekend', 'aqi', ('mean', 'median', 'std')).round(1)
             weekend_comparison.index = ['平日', '週末']
             weekend_comparison.columns = ['平均值', '中位數', '標準差']
 
@@ -249,11 +249,9 @@ def render(df: pd.DataFrame):
     # Calculate simple moving average forecast
     forecast_days = 3
 
-    # Aggregate daily data
-    daily_aqi = df.groupby(df['date'].dt.date)['aqi'].mean().reset_index()
-    daily_aqi.columns = ['date', 'aqi']
-    daily_aqi['date'] = pd.to_datetime(daily_aqi['date'])
-    daily_aqi = daily_aqi.sort_values('date')
+    # Aggregate daily data; normalized timestamps keep the key datetime64
+    # and the groupby returns the days in order
+    daily_aqi = df.groupby(df['date'].dt.normalize())['aqi'].mean().reset_index()
 
     # Calculate 7-day moving average
     window = min(7, len(daily_aqi))
@@ -456,7 +454,7 @@ def render(df: pd.DataFrame):
 
         # Analyze monitoring coverage
         if 'county' in df.columns:
-            county_coverage = df.groupby('county')['sitename'].nunique().sort_values()
+            county_coverage = df.groupby('county', observed=True)['sitename'].nunique().sort_values()
 
             st.write("**各縣市監測站數量:**")
             st.bar_chart(county_coverage)
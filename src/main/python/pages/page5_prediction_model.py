@@ -196,11 +196,10 @@ def render(df: pd.DataFrame):
         fig = go.Figure()
 
         # Historical data (last 30 days)
-        historical = df.tail(30 * 24).groupby(df['date'].dt.date)[
+        historical = df.tail(30 * 24).groupby(df['date'].dt.normalize())[
             target_variable.lower() if target_variable != 'AQI' else 'aqi'
         ].mean().reset_index()
         historical.columns = ['date', 'value']
-        historical['date'] = pd.to_datetime(historical['date'])
 
         fig.add_trace(go.Scatter(
             x=historical['date'],
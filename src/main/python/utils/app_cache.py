@@ -0,0 +1,119 @@
+"""
+Cached Aggregations Shared by the Streamlit Pages
+
+Streamlit reruns a page from the top on every widget interaction. The
+group-by reductions in this module are memoized with st.cache_data, keyed on
+the contents of the loaded DataFrame (see dataframe_cache_key), so a rerun
+with the same data is a cache lookup instead of a pass over every record.
+
+Author: Claude Code
+Date: 2025-10-14
+"""
+
+import streamlit as st
+import pandas as pd
+from typing import Optional, Tuple
+
+from utils.app_utils import 空氣質量結構, DATAFRAME_CACHE
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def group_mean(df: pd.DataFrame, by: str, value_col: str = 'aqi') -> pd.Series:
+    """
+    Average a column within each group of a label column.
+
+    Args:
+        df: Air quality DataFrame
+        by: Column to group by
+        value_col: Column to average
+
+    Returns:
+        Series of group means indexed by the groups present in the data
+
+    Example:
+        >>> county_aqi = group_mean(df, 'county').sort_values(ascending=False)
+    """
+    return df.groupby(by, observed=True)[value_col].mean()
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def group_agg(
+    df: pd.DataFrame,
+    by: str,
+    value_col: str = 'aqi',
+    funcs: Tuple[str, ...] = ('mean',)
+) -> pd.DataFrame:
+    """
+    Apply several reductions to a column within each group in one pass.
+
+    Args:
+        df: Air quality DataFrame
+        by: Column to group by
+        value_col: Column to reduce
+        funcs: Names of the reductions, e.g. ('mean', 'std', 'max')
+
+    Returns:
+        DataFrame with one column per reduction, indexed by group
+    """
+    return df.groupby(by, observed=True)[value_col].agg(list(funcs))
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def pivot_mean(df: pd.DataFrame, index: str, columns: str, value_col: str = 'aqi') -> pd.DataFrame:
+    """
+    Tabulate the mean of a column over two label columns.
+
+    Args:
+        df: Air quality DataFrame
+        index: Column for the table rows
+        columns: Column for the table columns
+        value_col: Column to average
+
+    Returns:
+        Matrix of means (rows from index, columns from columns); combinations
+        without data are NaN
+    """
+    return df.groupby([index, columns], observed=True)[value_col].mean().unstack(columns)
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def correlation_matrix(df: pd.DataFrame, columns: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    Pearson correlation matrix of a set of columns.
+
+    Args:
+        df: Air quality DataFrame
+        columns: Columns to correlate (pairwise-complete observations)
+
+    Returns:
+        Square correlation matrix indexed by the column names
+    """
+    return df[list(columns)].corr()
+
+
+@st.cache_data(**DATAFRAME_CACHE)
+def structure_table(
+    df: pd.DataFrame,
+    group_by: str,
+    sort_by: Optional[str] = None,
+    ascending: bool = True
+) -> pd.DataFrame:
+    """
+    Cached air quality structure table (see 空氣質量結構).
+
+    Args:
+        df: Air quality DataFrame
+        group_by: Column to group by
+        sort_by: Optional metric column to order the groups by
+        ascending: Sort direction for sort_by
+
+    Returns:
+        Air quality structure table (ordered by group_by unless sort_by
+        is given)
+    """
+    structure = 空氣質量結構(df, group_by)
+
+    if sort_by is not None:
+        structure = structure.sort_values(sort_by, ascending=ascending)
+
+    return structure
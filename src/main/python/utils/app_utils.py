@@ -16,7 +16,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+import hashlib
+import weakref
+from typing import Optional, List, Dict, Any, Callable, MutableMapping
 import logging
 
 # Configure logging
@@ -105,6 +107,17 @@ def add_log(message: str, log_list: Optional[List[str]] = None) -> None:
     logger.info(message)
 
 
+# String label columns stored as pandas categoricals after prepare_data
+CATEGORICAL_LABEL_COLUMNS = (
+    'county', 'sitename', 'status', 'pollutant',
+    'region', 'aqi_level', 'pollutant_category'
+)
+
+# Site coordinates keep float64 precision (the Parquet converter stores them
+# that way too); float32 would shift a station by up to about a metre
+COORDINATE_COLUMNS = ('latitude', 'longitude')
+
+
 def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Prepare data by generating SPCT dimension labels and derived attributes.
@@ -131,12 +144,12 @@ def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     if not pd.api.types.is_datetime64_any_dtype(df['date']):
         df['date'] = pd.to_datetime(df['date'])
 
-    # Extract time components
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['day'] = df['date'].dt.day
-    df['hour'] = df['date'].dt.hour
-    df['dayofweek'] = df['date'].dt.dayofweek
+    # Extract time components (small integer dtypes; these are group keys)
+    df['year'] = df['date'].dt.year.astype('int16')
+    df['month'] = df['date'].dt.month.astype('int8')
+    df['day'] = df['date'].dt.day.astype('int8')
+    df['hour'] = df['date'].dt.hour.astype('int8')
+    df['dayofweek'] = df['date'].dt.dayofweek.astype('int8')
 
     # Quarter labels
     df['quarter'] = pd.cut(df['month'],
@@ -237,6 +250,22 @@ def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     # Pollution status indicator
     df['is_exceed'] = df['aqi'] > 100
 
+    # ===== Numeric dtypes =====
+    # Measurements are stored as float32 by the Parquet converter; frames
+    # from other sources are narrowed the same way so that describe() and
+    # the aggregations on every page move half as many bytes.
+    for col in df.select_dtypes(include='float64').columns:
+        if col not in COORDINATE_COLUMNS:
+            df[col] = df[col].astype('float32')
+
+    # ===== Label dtypes =====
+    # Low-cardinality string labels become categoricals so that groupby,
+    # unique and equality filters work on integer codes. Categories are taken
+    # from the loaded frame, so they only hold values that are present.
+    for col in CATEGORICAL_LABEL_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+
     logger.info(f"Data prepared: {len(df)} rows with SPCT dimension labels")
 
     return df
@@ -267,28 +296,26 @@ def 空氣質量結構(df: pd.DataFrame, group_by: str = 'county') -> pd.DataFra
         >>> structure = 空氣質量結構(df, 'county')
         >>> structure[['county', '平均AQI', '達標率']]
     """
-    result = df.groupby(group_by).agg({
-        'sitename': 'nunique',
-        'date': 'count',
-        'aqi': ['mean', 'median', 'max', 'min'],
-        'pm2.5': 'mean',
-        'pm10': 'mean',
-        'o3': 'mean'
-    }).reset_index()
-
-    # Flatten multi-level columns
-    result.columns = [
-        group_by,
-        '監測站數', '測量次數',
-        '平均AQI', 'AQI中位數', '最高AQI', '最低AQI',
-        '平均PM2.5', '平均PM10', '平均O3'
-    ]
+    # Named aggregation produces the display column names directly
+    grouped = df.groupby(group_by, observed=True)
+    result = grouped.agg(**{
+        '監測站數': ('sitename', 'nunique'),
+        '測量次數': ('date', 'count'),
+        '平均AQI': ('aqi', 'mean'),
+        'AQI中位數': ('aqi', 'median'),
+        '最高AQI': ('aqi', 'max'),
+        '最低AQI': ('aqi', 'min'),
+        '平均PM2.5': ('pm2.5', 'mean'),
+        '平均PM10': ('pm10', 'mean'),
+        '平均O3': ('o3', 'mean')
+    })
 
     # Calculate derived metrics
-    # Compliance rate: percentage of measurements with AQI <= 100
-    compliance = df[df['aqi'] <= 100].groupby(group_by).size()
-    total = df.groupby(group_by).size()
-    result['達標率'] = (compliance / total * 100).fillna(0).round(1)
+    # Compliance rate: percentage of measurements with AQI <= 100. Both
+    # sides are indexed by group label here, so the assignment aligns.
+    compliant = (df['aqi'] <= 100).groupby(df[group_by], observed=True).mean()
+    result['達標率'] = (compliant * 100).fillna(0).round(1)
+    result = result.reset_index()
 
     # Average measurements per station
     result['站均測量次數'] = (result['測量次數'] / result['監測站數']).round(0)
@@ -380,6 +407,101 @@ def get_aqi_recommendation(aqi: float, user_group: str = "一般民眾") -> str:
     return "數據異常，請查看最新官方公告。"
 
 
+def dataframe_cache_key(df: pd.DataFrame) -> tuple:
+    """
+    Content-based cache key for a DataFrame passed to st.cache_data functions.
+
+    The key combines the shape, column names, dtypes and a digest of the
+    row hashes (index included), so two frames only share a key when they
+    hold the same data. The digest costs one pass over the frame; it is
+    remembered per frame object (through a weak reference, so a new frame
+    that reuses a freed object's id is hashed afresh) and reruns with the
+    frame kept in session_state look it up instead of rehashing.
+
+    Args:
+        df: DataFrame used as a cached function argument
+
+    Returns:
+        Hashable tuple identifying the DataFrame's contents
+
+    Example:
+        >>> @st.cache_data(**DATAFRAME_CACHE)
+        ... def station_count(df):
+        ...     return df['sitename'].nunique()
+    """
+    entry = _frame_keys.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    key = (
+        df.shape,
+        tuple(str(col) for col in df.columns),
+        tuple(str(dtype) for dtype in df.dtypes),
+        hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    )
+
+    frame_id = id(df)
+
+    def _forget(ref: weakref.ref) -> None:
+        # Only drop the entry if it still belongs to the collected frame
+        current = _frame_keys.get(frame_id)
+        if current is not None and current[0] is ref:
+            del _frame_keys[frame_id]
+
+    _frame_keys[frame_id] = (weakref.ref(df, _forget), key)
+    return key
+
+
+# Digests of live DataFrames by id(), see dataframe_cache_key
+_frame_keys: Dict[int, tuple] = {}
+
+# st.cache_data settings shared by every per-DataFrame helper in the pages
+DATAFRAME_CACHE = dict(show_spinner=False, hash_funcs={pd.DataFrame: dataframe_cache_key})
+
+
+def memo_figure(
+    state: MutableMapping,
+    slot: str,
+    name: str,
+    df: pd.DataFrame,
+    build: Callable[[], Any]
+) -> Any:
+    """
+    Return a figure memoized in session state for the current DataFrame.
+
+    Each page keeps one slot holding the figures built for a single
+    DataFrame. The slot is tagged with dataframe_cache_key and cleared as
+    soon as a frame with different contents is rendered, so widget reruns
+    reuse the built figures while a reload never shows stale ones.
+
+    Args:
+        state: Session state mapping (st.session_state)
+        slot: Session state key owned by the calling page
+        name: Figure name, including any widget values it depends on
+        df: DataFrame the figure is derived from
+        build: Zero-argument callable that builds the figure
+
+    Returns:
+        The memoized figure
+
+    Example:
+        >>> fig = memo_figure(st.session_state, 'page1_figures', 'missing_bar',
+        ...                   df, build_missing_bar)
+    """
+    memo = state.setdefault(slot, {})
+    key = dataframe_cache_key(df)
+
+    if memo.get('key') != key:
+        memo.clear()
+        memo['key'] = key
+
+    if name not in memo:
+        memo[name] = build()
+
+    return memo[name]
+
+
 def filter_data(
     df: pd.DataFrame,
     start_date: Optional[str] = None,
@@ -18,11 +18,14 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Compass sectors of the wind rose, clockwise from north
+WIND_ROSE_DIRECTIONS = ['北', '東北', '東', '東南', '南', '西南', '西', '西北']
+
 
 def create_time_series_plot(
     df: pd.DataFrame,
@@ -166,15 +169,41 @@ def create_crosstab_heatmap(
     Example:
         >>> fig = create_crosstab_heatmap(df, 'month', 'county', 'aqi', 'mean')
     """
-    # Create pivot table
-    pivot_data = df.pivot_table(
-        index=y_col,
-        columns=x_col,
-        values=value_col,
-        aggfunc=agg_func
+    # Grouped aggregation unstacked into a matrix; faster than pivot_table,
+    # and observed=True keeps empty categorical combinations out
+    pivot_data = (
+        df.groupby([y_col, x_col], observed=True)[value_col]
+        .agg(agg_func)
+        .unstack(x_col)
     )
 
-    # Create heatmap
+    return create_heatmap(pivot_data, x_col, y_col, value_col, title)
+
+
+def create_heatmap(
+    pivot_data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    value_col: str,
+    title: Optional[str] = None
+) -> go.Figure:
+    """
+    Create heatmap from an already aggregated crosstab matrix.
+
+    Args:
+        pivot_data: Matrix with y_col values as index and x_col values as columns
+        x_col: Name of the column dimension
+        y_col: Name of the row dimension
+        value_col: Name of the aggregated value (used for the colorbar)
+        title: Plot title
+
+    Returns:
+        Plotly Figure object
+
+    Example:
+        >>> matrix = df.groupby(['county', 'month'])['aqi'].mean().unstack()
+        >>> fig = create_heatmap(matrix, 'month', 'county', 'aqi')
+    """
     fig = go.Figure(data=go.Heatmap(
         z=pivot_data.values,
         x=pivot_data.columns,
@@ -223,7 +252,7 @@ def create_map_plot(
         Plotly Figure object
     """
     # Aggregate by station
-    station_data = df.groupby(['sitename', 'county', 'latitude', 'longitude']).agg({
+    station_data = df.groupby(['sitename', 'county', 'latitude', 'longitude'], observed=True).agg({
         'aqi': 'mean',
         'pm2.5': 'mean',
         'pm10': 'mean'
@@ -395,7 +424,23 @@ def create_correlation_matrix(
     # Calculate correlation matrix
     corr_matrix = df[columns].corr()
 
-    # Create heatmap
+    return create_correlation_heatmap(corr_matrix, title)
+
+
+def create_correlation_heatmap(
+    corr_matrix: pd.DataFrame,
+    title: str = "污染物相關性矩陣"
+) -> go.Figure:
+    """
+    Create correlation heatmap from an already computed correlation matrix.
+
+    Args:
+        corr_matrix: Square correlation matrix (e.g. from DataFrame.corr())
+        title: Plot title
+
+    Returns:
+        Plotly Figure object
+    """
     fig = go.Figure(data=go.Heatmap(
         z=corr_matrix.values,
         x=corr_matrix.columns,
@@ -438,7 +483,7 @@ def create_seasonal_pattern_plot(
         Plotly Figure object
     """
     # Calculate seasonal statistics
-    seasonal_stats = df.groupby('season')[value_col].agg(['mean', 'std']).reset_index()
+    seasonal_stats = df.groupby('season', observed=True)[value_col].agg(['mean', 'std']).reset_index()
 
     fig = go.Figure()
 
@@ -483,32 +528,15 @@ def create_wind_rose(
     Returns:
         Plotly Figure object
     """
-    # Bin wind directions into 8 compass directions
-    def direction_category(degree):
-        if pd.isna(degree):
-            return None
-        if degree < 22.5 or degree >= 337.5:
-            return '北'
-        elif degree < 67.5:
-            return '東北'
-        elif degree < 112.5:
-            return '東'
-        elif degree < 157.5:
-            return '東南'
-        elif degree < 202.5:
-            return '南'
-        elif degree < 247.5:
-            return '西南'
-        elif degree < 292.5:
-            return '西'
-        else:
-            return '西北'
+    # Bin wind directions into 8 compass sectors of 45 degrees centred on
+    # north, shifting by half a sector so that 337.5-22.5 maps to sector 0
+    degrees = df['winddirec'].to_numpy(dtype=np.float64)
+    degrees = degrees[~np.isnan(degrees)]
+    sectors = (np.mod(degrees + 22.5, 360) // 45).astype(np.intp)
 
-    df_wind = df.copy()
-    df_wind['wind_direction'] = df_wind['winddirec'].apply(direction_category)
-
-    # Count occurrences
-    wind_counts = df_wind['wind_direction'].value_counts()
+    # Count occurrences, most frequent direction first
+    wind_counts = pd.Series(np.bincount(sectors, minlength=8), index=WIND_ROSE_DIRECTIONS)
+    wind_counts = wind_counts[wind_counts > 0].sort_values(ascending=False)
 
     # Create polar bar chart
     fig = go.Figure(go.Barpolar(
@@ -576,6 +604,37 @@ def create_comparison_plot(
     return fig
 
 
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing moving average computed from cumulative sums.
+
+    Matches ``Series.rolling(window).mean()``: a window containing any
+    missing value, and the first ``window - 1`` positions, are NaN.
+
+    Args:
+        values: 1-D array of values
+        window: Window size
+
+    Returns:
+        Float64 array of the same length
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+
+    if window < 1 or len(values) < window:
+        return result
+
+    missing = np.isnan(values)
+    sums = np.cumsum(np.where(missing, 0.0, values))
+    gaps = np.cumsum(missing)
+
+    window_sums = sums[window - 1:] - np.concatenate(([0.0], sums[:-window]))
+    window_gaps = gaps[window - 1:] - np.concatenate(([0], gaps[:-window]))
+
+    result[window - 1:] = np.where(window_gaps == 0, window_sums / window, np.nan)
+    return result
+
+
 def create_trend_with_moving_average(
     df: pd.DataFrame,
     value_col: str = 'aqi',
@@ -597,7 +656,7 @@ def create_trend_with_moving_average(
     df_sorted = df.sort_values('date')
 
     # Calculate moving average
-    df_sorted[f'{value_col}_ma'] = df_sorted[value_col].rolling(window=window).mean()
+    df_sorted[f'{value_col}_ma'] = moving_average(df_sorted[value_col].to_numpy(), window)
 
     fig = go.Figure()
 
@@ -632,6 +691,45 @@ def create_trend_with_moving_average(
     return fig
 
 
+def _add_trendlines(fig: go.Figure, trendline: Optional[Tuple[float, float]] = None) -> None:
+    """
+    Draw a least-squares line across each scatter trace of a figure.
+
+    Args:
+        fig: Figure whose scatter traces get a matching trendline
+        trendline: Optional precomputed (slope, intercept) used instead of
+            fitting when the figure has a single trace
+    """
+    for trace in list(fig.data):
+        x = np.asarray(trace.x, dtype=np.float64)
+        y = np.asarray(trace.y, dtype=np.float64)
+        if len(x) < 2:
+            continue
+
+        if trendline is not None and len(fig.data) == 1:
+            slope, intercept = trendline
+        else:
+            x_mean, y_mean = x.mean(), y.mean()
+            dx = x - x_mean
+            sxx = np.dot(dx, dx)
+            if sxx == 0:
+                continue
+            slope = np.dot(dx, y - y_mean) / sxx
+            intercept = y_mean - slope * x_mean
+
+        ends = np.array([x.min(), x.max()])
+        fig.add_scatter(
+            x=ends,
+            y=slope * ends + intercept,
+            mode='lines',
+            name=trace.name,
+            legendgroup=trace.legendgroup,
+            showlegend=False,
+            line=dict(color=trace.marker.color, width=2),
+            hoverinfo='skip'
+        )
+
+
 def create_scatter_plot(
     df: pd.DataFrame,
     x_col: str,
@@ -639,11 +737,15 @@ def create_scatter_plot(
     title: Optional[str] = None,
     show_trendline: bool = True,
     color_col: Optional[str] = None,
-    size_col: Optional[str] = None
+    size_col: Optional[str] = None,
+    trendline: Optional[Tuple[float, float]] = None
 ) -> go.Figure:
     """
     Create scatter plot for bivariate analysis.
 
+    Trendlines are least-squares lines drawn from numpy sums rather than
+    plotly's statsmodels OLS, with one line per colour group.
+
     Args:
         df: Input DataFrame
         x_col: Column name for x-axis
@@ -652,6 +754,8 @@ def create_scatter_plot(
         show_trendline: Whether to show linear regression trendline
         color_col: Optional column for color grouping (e.g., 'season', 'region')
         size_col: Optional column for bubble size
+        trendline: Optional precomputed (slope, intercept) for the whole
+            dataset; only used without color_col
 
     Returns:
         Plotly Figure object
@@ -682,14 +786,6 @@ def create_scatter_plot(
         )
         return fig
 
-    # Calculate correlation coefficient
-    from scipy.stats import pearsonr
-    try:
-        corr, pvalue = pearsonr(df_clean[x_col], df_clean[y_col])
-    except Exception as e:
-        logger.warning(f"Failed to calculate correlation: {e}")
-        corr, pvalue = None, None
-
     # Create scatter plot
     if color_col:
         fig = px.scatter(
@@ -700,7 +796,6 @@ def create_scatter_plot(
             size=size_col if size_col else None,
             title=title or f"{y_col.upper()} vs {x_col.upper()}",
             labels={x_col: x_col.upper(), y_col: y_col.upper()},
-            trendline="ols" if show_trendline else None,
             opacity=0.6
         )
     else:
@@ -711,7 +806,6 @@ def create_scatter_plot(
             size=size_col if size_col else None,
             title=title or f"{y_col.upper()} vs {x_col.upper()}",
             labels={x_col: x_col.upper(), y_col: y_col.upper()},
-            trendline="ols" if show_trendline else None,
             opacity=0.6,
             color_discrete_sequence=['#1f77b4']
         )
@@ -737,6 +831,9 @@ def create_scatter_plot(
         )
     )
 
+    if show_trendline:
+        _add_trendlines(fig, None if color_col else trendline)
+
     # Note: Correlation annotation removed per user request
     # Users prefer to observe trends visually without statistical text overlay
 
@@ -0,0 +1,76 @@
+"""
+Downsampling of Line Chart Data
+
+Plotly serializes every point of a trace to JSON, so multi-year daily series
+are thinned before plotting. Largest-Triangle-Three-Buckets (LTTB) keeps the
+points that carry the visual shape of the line (peaks, troughs and turns)
+instead of every n-th point.
+
+Author: Claude Code
+Date: 2025-10-14
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def lttb(df: pd.DataFrame, x_col: str, y_col: str, n_out: int) -> pd.DataFrame:
+    """
+    Downsample a line to n_out points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into n_out - 2 buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket is selected.
+
+    Args:
+        df: Data sorted by x_col
+        x_col: Numeric or datetime column for the x-axis
+        y_col: Numeric column for the y-axis; rows where it is missing are
+            dropped before sampling
+        n_out: Number of points to keep
+
+    Returns:
+        The selected rows of df (all rows when it has at most n_out points)
+
+    Example:
+        >>> daily = lttb(daily, 'date', 'aqi', 500)
+    """
+    data = df[df[y_col].notna()]
+    n = len(data)
+
+    if n_out >= n or n_out < 3:
+        return data
+
+    x_values = data[x_col].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('datetime64[ns]').astype(np.int64)
+    x = x_values.astype(np.float64)
+    y = data[y_col].to_numpy(dtype=np.float64)
+
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.intp) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = end if i + 2 < len(edges) else n - 1
+        cx = x[next_start:next_end].mean()
+        cy = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - cx) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (cy - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return data.iloc[selected]
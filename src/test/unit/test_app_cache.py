@@ -0,0 +1,106 @@
+"""
+Unit Tests for Cached Page Aggregations
+
+Tests for app_cache.py module including:
+- Group means and multi-reduction aggregations
+- Two-way mean tables for heatmaps
+
+Author: Claude Code
+Date: 2025-10-14
+"""
+
+import unittest
+try:
+    import pytest
+    import pandas as pd
+    import numpy as np
+except Exception as e:
+    raise unittest.SkipTest(f"Skipping test_app_cache due to missing dependencies: {e}")
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent.parent / "main" / "python"
+sys.path.insert(0, str(src_path))
+
+from utils.app_utils import prepare_data
+from utils.app_cache import group_mean, group_agg, pivot_mean, correlation_matrix
+
+
+@pytest.fixture
+def sample_data():
+    """
+    Create prepared air quality data for testing.
+
+    Returns:
+        DataFrame with SPCT labels
+    """
+    dates = pd.date_range(start='2024-01-01', end='2024-06-30', freq='6h')
+    n = len(dates)
+
+    data = pd.DataFrame({
+        'date': dates,
+        'sitename': np.random.choice(['中山', '板橋', '桃園'], n),
+        'county': np.random.choice(['台北市', '新北市', '桃園市'], n),
+        'aqi': np.random.randint(20, 150, n).astype(float),
+        'pm2.5': np.random.uniform(5, 50, n),
+        'pollutant': np.random.choice(['PM2.5', 'PM10', 'O3'], n),
+        'windspeed': np.random.uniform(0, 8, n)
+    })
+
+    return prepare_data(data)
+
+
+class TestGroupAggregations:
+    """Test suite for the cached group-by helpers"""
+
+    def test_group_mean_matches_groupby(self, sample_data):
+        """Test that group means equal a plain pandas groupby"""
+        result = group_mean(sample_data, 'county')
+        expected = sample_data.groupby('county', observed=True)['aqi'].mean()
+
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_group_agg_has_column_per_reduction(self, sample_data):
+        """Test that every requested reduction becomes a column"""
+        result = group_agg(sample_data, 'season', 'aqi', ('mean', 'max', 'count'))
+
+        assert list(result.columns) == ['mean', 'max', 'count']
+        assert result['count'].sum() == sample_data['aqi'].count()
+
+    def test_group_agg_skips_unobserved_categories(self, sample_data):
+        """Test that categories without records produce no rows"""
+        subset = sample_data[sample_data['month'] <= 2]
+        result = group_agg(subset, 'season', 'aqi', ('mean',))
+
+        assert set(result.index) == set(subset['season'].unique())
+
+
+class TestPivotMean:
+    """Test suite for pivot_mean function"""
+
+    def test_pivot_shape_and_values(self, sample_data):
+        """Test that the table matches pivot_table on the same data"""
+        result = pivot_mean(sample_data, 'county', 'month')
+        expected = sample_data.pivot_table(
+            index='county', columns='month', values='aqi',
+            aggfunc='mean', observed=True
+        )
+
+        assert result.shape == expected.shape
+        assert np.allclose(result.to_numpy(), expected.to_numpy())
+
+
+class TestCorrelationMatrix:
+    """Test suite for correlation_matrix function"""
+
+    def test_matrix_matches_corr(self, sample_data):
+        """Test that the cached matrix equals DataFrame.corr()"""
+        result = correlation_matrix(sample_data, ('aqi', 'pm2.5', 'windspeed'))
+        expected = sample_data[['aqi', 'pm2.5', 'windspeed']].corr()
+
+        pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
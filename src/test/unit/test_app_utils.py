@@ -31,7 +31,9 @@ from utils.app_utils import (
     空氣質量結構,
     get_aqi_color,
     get_aqi_recommendation,
-    filter_data
+    filter_data,
+    dataframe_cache_key,
+    memo_figure
 )
 
 
@@ -132,6 +134,39 @@ class TestPrepareData:
         # Check wind level categories
         assert df['wind_level'].dtype == 'category'
 
+    def test_prepare_data_uses_categorical_labels(self, sample_data):
+        """Test that string label columns are stored as categoricals"""
+        df = prepare_data(sample_data)
+
+        for col in ['county', 'sitename', 'pollutant', 'region', 'aqi_level']:
+            assert df[col].dtype == 'category'
+
+        # Only values present in the data become categories
+        assert set(df['county'].cat.categories) == set(sample_data['county'])
+
+    def test_prepare_data_downcasts_float_measurements(self, sample_data):
+        """Test that float64 measurement columns are narrowed to float32"""
+        df = prepare_data(sample_data)
+
+        for col in ['pm2.5', 'pm10', 'o3', 'windspeed']:
+            assert df[col].dtype == np.float32
+
+    def test_prepare_data_keeps_coordinate_precision(self, sample_data):
+        """Test that site coordinates are not narrowed to float32"""
+        df = prepare_data(sample_data)
+
+        for col in ['latitude', 'longitude']:
+            assert df[col].dtype == np.float64
+            assert (df[col] == sample_data[col]).all()
+
+    def test_prepare_data_uses_small_int_time_parts(self, sample_data):
+        """Test that calendar components use narrow integer dtypes"""
+        df = prepare_data(sample_data)
+
+        assert df['year'].dtype == np.int16
+        for col in ['month', 'day', 'hour', 'dayofweek']:
+            assert df[col].dtype == np.int8
+
     def test_prepare_data_preserves_original_data(self, sample_data):
         """Test that original data is preserved after transformation"""
         original_len = len(sample_data)
@@ -314,5 +349,69 @@ class TestFilterData:
         assert len(filtered) == len(sample_data)
 
 
+
+class TestDataFrameCacheKey:
+    """Test the cache key used for st.cache_data DataFrame arguments"""
+
+    def test_same_frame_same_key(self, sample_data):
+        """Test that the key is stable for an unchanged DataFrame"""
+        assert dataframe_cache_key(sample_data) == dataframe_cache_key(sample_data)
+
+    def test_different_frames_differ(self, sample_data):
+        """Test that a filtered copy gets a different key"""
+        subset = sample_data.head(10)
+        assert dataframe_cache_key(subset) != dataframe_cache_key(sample_data)
+
+    def test_same_shape_different_values_differ(self, sample_data):
+        """Test that frames with equal shape and columns but other data differ"""
+        other = sample_data.copy()
+        other['aqi'] = other['aqi'] + 1000
+        assert dataframe_cache_key(other) != dataframe_cache_key(sample_data)
+
+    def test_reused_object_id_is_rehashed(self):
+        """Test that a new frame at a freed frame's address gets its own key"""
+        import gc
+
+        keys = set()
+        for offset in range(6):
+            frame = pd.DataFrame({'aqi': np.arange(50, dtype=float) + offset * 1000})
+            keys.add(dataframe_cache_key(frame))
+            del frame
+            gc.collect()
+
+        assert len(keys) == 6
+
+    def test_equal_content_same_key(self, sample_data):
+        """Test that an identical copy maps to the same cached results"""
+        assert dataframe_cache_key(sample_data.copy()) == dataframe_cache_key(sample_data)
+
+
+class TestMemoFigure:
+    """Test the session_state figure memo used by the pages"""
+
+    def test_reuses_figure_for_same_frame(self, sample_data):
+        """Test that a rerun with the same frame does not rebuild"""
+        state = {}
+        builds = []
+        build = lambda: builds.append(1) or object()
+
+        first = memo_figure(state, 'figs', 'bar', sample_data, build)
+        second = memo_figure(state, 'figs', 'bar', sample_data, build)
+
+        assert first is second
+        assert len(builds) == 1
+
+    def test_rebuilds_after_reload(self, sample_data):
+        """Test that a frame with different contents clears the memo"""
+        state = {}
+        first = memo_figure(state, 'figs', 'bar', sample_data, object)
+
+        reloaded = sample_data.copy()
+        reloaded['aqi'] = reloaded['aqi'] + 1
+        second = memo_figure(state, 'figs', 'bar', reloaded, object)
+
+        assert first is not second
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -106,6 +106,44 @@ class TestCSVToParquetConverter(unittest.TestCase):
         self.assertEqual(optimized_df['sitename'].dtype.name, 'category')
         self.assertEqual(optimized_df['county'].dtype.name, 'category')
 
+    def test_optimize_datatypes_coerces_invalid_numbers(self):
+        """
+        Test that non-numeric tokens in numeric columns become NaN.
+        """
+        converter = CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        )
+
+        df = pd.DataFrame({
+            'aqi': ['50', 'ND', '70'],
+            'pm2.5': ['15.0', '16.5', None]
+        })
+
+        optimized_df = converter._optimize_datatypes(df)
+
+        self.assertEqual(optimized_df['aqi'].dtype, 'float32')
+        self.assertEqual(optimized_df['pm2.5'].dtype, 'float32')
+        self.assertTrue(pd.isna(optimized_df['aqi'].iloc[1]))
+        self.assertEqual(optimized_df['aqi'].iloc[2], 70.0)
+        self.assertTrue(pd.isna(optimized_df['pm2.5'].iloc[2]))
+
+    def test_optimize_datatypes_shares_categories_across_chunks(self):
+        """
+        Test that later chunks extend, not replace, the category list.
+        """
+        converter = CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        )
+
+        first = converter._optimize_datatypes(pd.DataFrame({'county': ['B', 'A']}))
+        second = converter._optimize_datatypes(pd.DataFrame({'county': ['C', 'A']}))
+
+        self.assertEqual(list(first['county'].cat.categories), ['B', 'A'])
+        self.assertEqual(list(second['county'].cat.categories), ['B', 'A', 'C'])
+        self.assertEqual(list(second['county'].cat.codes), [2, 1])
+
     def test_add_partition_columns(self):
         """
         Test adding partition columns.
@@ -124,9 +162,63 @@ class TestCSVToParquetConverter(unittest.TestCase):
         # Add partition columns
         result = converter._add_partition_columns(df)
 
-        # Verify year column was added
+        # Verify year and month columns were added
         self.assertIn('year', result.columns)
+        self.assertIn('month', result.columns)
         self.assertEqual(result['year'].iloc[0], 2024)
+        self.assertEqual(result['month'].iloc[0], 1)
+
+    def test_convert_reports_partitions(self):
+        """
+        Test that convert() writes year partitions and reports them.
+        """
+        converter = CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        )
+
+        stats = converter.convert()
+
+        self.assertEqual(stats['total_rows'], 2)
+        self.assertEqual(stats['partitions'], [2024])
+        self.assertTrue((self.output_dir / 'year=2024' / 'month=1').is_dir())
+
+    def test_convert_skips_null_year_partition(self):
+        """
+        Test that rows without a date do not break partition reporting.
+        """
+        with open(self.test_csv, 'a') as f:
+            f.write("\n,TestSite,TestCounty,60.0,PM2.5,Good,1.2,0.22,32.0,37.0,22.0,17.0,5.2,6.2,1.2,2.2,182.0,,0.22,18.0,24.0,1.2,121.0,25.0,1.0")
+
+        converter = CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        )
+
+        stats = converter.convert()
+
+        self.assertEqual(stats['total_rows'], 3)
+        self.assertEqual(stats['partitions'], [2024])
+
+    def test_convert_ignores_files_from_earlier_runs(self):
+        """
+        Test that stats only cover the files written by this conversion.
+        """
+        converter = CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        )
+        converter.convert()
+
+        # Leftover partition from an earlier conversion of other data
+        stale = self.output_dir / 'year=2019' / 'month=1'
+        stale.mkdir(parents=True)
+        shutil.copy(next(self.output_dir.rglob('*.parquet')), stale / 'old.parquet')
+
+        stats = converter.convert()
+
+        self.assertEqual(stats['total_rows'], 2)
+        self.assertEqual(stats['partitions'], [2024])
 
     def test_get_conversion_info(self):
         """
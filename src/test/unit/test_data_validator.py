@@ -0,0 +1,100 @@
+"""
+Unit tests for conversion data validation.
+
+Tests the DataValidator class.
+
+Author: Claude Code
+Date: 2025-10-13
+"""
+
+import unittest
+try:
+    import pandas as pd
+    import duckdb
+except Exception as e:
+    raise unittest.SkipTest(f"Skipping test_data_validator due to missing dependencies: {e}")
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root / 'src' / 'main' / 'python'))
+
+from core.csv_to_parquet_converter import CSVToParquetConverter
+from core.data_validator import DataValidator
+
+
+class TestDataValidator(unittest.TestCase):
+    """
+    Test cases for DataValidator class.
+    """
+
+    def setUp(self):
+        """
+        Set up a converted dataset in the default processed-directory layout.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.test_csv = Path(self.test_dir) / "test.csv"
+        self.output_dir = Path(self.test_dir) / "processed"
+        self.db_path = self.output_dir / "air_quality.duckdb"
+
+        test_data = """date,sitename,county,aqi,pollutant,status,so2,co,o3,o3_8hr,pm10,pm2.5,no2,nox,no,windspeed,winddirec,unit,co_8hr,pm2.5_avg,pm10_avg,so2_avg,longitude,latitude,siteid
+2024-01-01 00:00,TestSite,TestCounty,50.0,PM2.5,Good,1.0,0.2,30.0,35.0,20.0,15.0,5.0,6.0,1.0,2.0,180.0,,0.2,16.0,22.0,1.0,121.0,25.0,1.0
+2024-01-01 01:00,TestSite,TestCounty,55.0,PM2.5,Good,1.1,0.21,31.0,36.0,21.0,16.0,5.1,6.1,1.1,2.1,181.0,,0.21,17.0,23.0,1.1,121.0,25.0,1.0"""
+
+        with open(self.test_csv, 'w') as f:
+            f.write(test_data)
+
+        CSVToParquetConverter(
+            csv_path=str(self.test_csv),
+            output_dir=str(self.output_dir)
+        ).convert()
+
+        # The database lives next to the year partitions, as in run_conversion
+        conn = duckdb.connect(str(self.db_path))
+        conn.execute("CREATE TABLE air_quality AS SELECT * FROM range(2)")
+        conn.close()
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        if Path(self.test_dir).exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_ignores_database_in_parquet_dir(self):
+        """
+        Test that the DuckDB file beside the partitions is not read as Parquet.
+        """
+        validator = DataValidator(
+            csv_path=str(self.test_csv),
+            parquet_dir=str(self.output_dir),
+            db_path=str(self.db_path)
+        )
+
+        results = validator.validate_all()
+
+        self.assertIsNone(results['parquet_error'])
+        self.assertEqual(results['row_counts']['parquet'], 2)
+        self.assertTrue(results['validation_passed'])
+
+    def test_unreadable_parquet_fails_validation(self):
+        """
+        Test that a missing Parquet dataset fails validation.
+        """
+        validator = DataValidator(
+            csv_path=str(self.test_csv),
+            parquet_dir=str(Path(self.test_dir) / "missing"),
+            db_path=str(self.db_path)
+        )
+
+        results = validator.validate_all()
+
+        self.assertIsNotNone(results['parquet_error'])
+        self.assertFalse(results['validation_passed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
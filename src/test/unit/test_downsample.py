@@ -0,0 +1,78 @@
+"""
+Unit Tests for Line Chart Downsampling
+
+Tests for downsample.py module including:
+- LTTB point selection on daily series
+
+Author: Claude Code
+Date: 2025-10-14
+"""
+
+import unittest
+try:
+    import pytest
+    import pandas as pd
+    import numpy as np
+except Exception as e:
+    raise unittest.SkipTest(f"Skipping test_downsample due to missing dependencies: {e}")
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent.parent / "main" / "python"
+sys.path.insert(0, str(src_path))
+
+from utils.downsample import lttb
+
+
+@pytest.fixture
+def daily_series():
+    """
+    Create a smooth daily AQI series with one sharp spike.
+
+    Returns:
+        DataFrame with date and aqi columns
+    """
+    n = 2000
+    df = pd.DataFrame({
+        'date': pd.date_range(start='2020-01-01', periods=n, freq='D'),
+        'aqi': np.sin(np.arange(n) / 40) * 40 + 70
+    })
+    df.loc[123, 'aqi'] = 450
+    return df
+
+
+class TestLTTB:
+    """Test suite for lttb function"""
+
+    def test_returns_requested_points_in_order(self, daily_series):
+        """Test output size, ordering and kept endpoints"""
+        result = lttb(daily_series, 'date', 'aqi', 300)
+
+        assert len(result) == 300
+        assert result['date'].is_monotonic_increasing
+        assert result.index[0] == daily_series.index[0]
+        assert result.index[-1] == daily_series.index[-1]
+
+    def test_keeps_spike(self, daily_series):
+        """Test that an isolated extreme value survives sampling"""
+        result = lttb(daily_series, 'date', 'aqi', 300)
+        assert result['aqi'].max() == 450
+
+    def test_short_series_unchanged(self, daily_series):
+        """Test that a series within the budget is returned whole"""
+        short = daily_series.head(100)
+        result = lttb(short, 'date', 'aqi', 300)
+        assert len(result) == len(short)
+
+    def test_missing_values_dropped(self, daily_series):
+        """Test that rows without a y value are never selected"""
+        daily_series.loc[::5, 'aqi'] = np.nan
+        result = lttb(daily_series, 'date', 'aqi', 300)
+
+        assert len(result) == 300
+        assert result['aqi'].notna().all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -49,6 +49,7 @@ class FakeSt:
     def __init__(self):
         self.dataframe_calls = []
         self.plotly_chart_calls = []
+        self.session_state = {}
 
     # Layout primitives
     def header(self, *args, **kwargs):
@@ -75,6 +76,9 @@ class FakeSt:
     def text(self, *args, **kwargs):
         pass
 
+    def write(self, *args, **kwargs):
+        pass
+
     def metric(self, *args, **kwargs):
         pass
 
@@ -107,6 +111,9 @@ class FakeSt:
             return (args[0] + args[1]) // 2
         return None
 
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
     def download_button(self, *args, **kwargs):
         pass
 
@@ -186,6 +193,34 @@ class TestAppUtilsAndPages(unittest.TestCase):
         dtype_col = dtype_tables[0]['數據類型']
         self.assertTrue(all(isinstance(v, str) for v in dtype_col.tolist()))
 
+    def test_page1_display_rows_keep_missing_values_last(self):
+        """
+        The raw-data table should show num_rows records like sort_values,
+        with missing aqi/date values last in both directions.
+        """
+        df = app_utils.prepare_data(make_sample_df(5))
+        df.loc[[1, 3], 'aqi'] = np.nan
+        df.loc[[0, 2], 'date'] = pd.NaT
+
+        cases = [
+            ("AQI最高", 'aqi', False),
+            ("AQI最低", 'aqi', True),
+            ("最新記錄", 'date', False),
+            ("最舊記錄", 'date', True),
+        ]
+        for sort_by, col, ascending in cases:
+            for num_rows in (2, 4, 5):
+                result = p1._display_rows(df, sort_by, num_rows)
+                expected = df.sort_values(col, ascending=ascending).head(num_rows)
+
+                self.assertEqual(len(result), num_rows)
+                self.assertEqual(
+                    result[col].isna().tolist(), expected[col].isna().tolist()
+                )
+                self.assertEqual(
+                    result[col].dropna().tolist(), expected[col].dropna().tolist()
+                )
+
     def test_page2_no_deprecated_width(self):
         """
         Rendering page2 should not use deprecated `use_container_width`.